@@ -2,28 +2,24 @@ import streamlit as st
 from dotenv import load_dotenv
 import os
 
+# Load environment variables before importing the app modules, which read
+# their settings (Data Dragon / Riot URLs, TTLs, cache sizes) at import time
+load_dotenv()  # This will load from .env by default
+if os.path.exists(""):
+    load_dotenv("", override=True)
+
 from components.sidebar import render_sidebar
 from components.enhanced_welcome import render_enhanced_welcome
-from utils.langchain_utils import (
-    save_analysis_to_file,
-    create_chat_chain,
-    answer_question,
-)
 from components.header import render_header
-from components.team_analysis import render_team_analysis
+from components.team_analysis import render_team_analysis, render_meta_analysis
 from components.player_analysis import render_player_analysis
 from components.matchup_insights import render_matchup_insights
 from utils.session_state import initialize_session_state
-from utils.langchain_utils import (
-    save_analysis_to_file,
-    create_chat_chain,
-    answer_question,
-)
+from utils.chat_history import history_for_chain, fold_history
+from utils.warmup import start_warmup
 
-# Load environment variables
-load_dotenv()  # This will load from .env by default
-if os.path.exists(""):
-    load_dotenv("", override=True)
+# Fill the static data, patch analysis and video caches in the background (once per server process)
+warmup_job = start_warmup()
 
 # App configuration
 st.set_page_config(
@@ -42,20 +38,28 @@ def main():
     # Initialize session state
     initialize_session_state()
 
-    # Render sidebar
-    render_sidebar()
-
     # Render header
     render_header()
 
+    # Let the first visitors after a deploy know the caches are still filling
+    if warmup_job is not None and not warmup_job.is_warm():
+        steps = warmup_job.status()["steps"].values()
+        finished = sum(step["state"] in ("done", "skipped", "failed") for step in steps)
+        st.caption(f"Preparing champion data and patch insights ({finished}/{len(steps)})...")
+
+    # Placeholder the sidebar fills with analysis cards while they stream in
+    analysis_preview = st.empty()
+
+    # Render sidebar
+    render_sidebar(analysis_preview)
+
     # If analysis has been performed
     if st.session_state.get("analysis_performed", False):
-        # Save analysis data to file
-        analysis_data = st.session_state.analysis_results
-        analysis_file = save_analysis_to_file(analysis_data)
+        # LangChain, FAISS and the embedding backends load only once there is something to chat about
+        from utils.langchain_utils import create_chat_chain, answer_question
 
-        # Create chat chain
-        qa_chain = create_chat_chain(analysis_file)
+        # Create chat chain (cached per analysis, built from the in-memory results)
+        qa_chain = create_chat_chain(st.session_state.analysis_results)
 
         # Chat interface
         st.markdown(
@@ -67,11 +71,17 @@ def main():
             unsafe_allow_html=True,
         )
 
-        # Initialize chat history
+        # Initialize chat history (recent turns plus a summary of older ones)
         if "chat_history" not in st.session_state:
             st.session_state.chat_history = []
+        if "chat_summary" not in st.session_state:
+            st.session_state.chat_summary = ""
+
+        if st.session_state.chat_summary:
+            with st.expander("Earlier in this conversation"):
+                st.markdown(st.session_state.chat_summary)
 
-        # Display chat messages
+        # Display every turn not yet folded into the summary above
         for message in st.session_state.chat_history:
             with st.chat_message("user"):
                 st.write(message[0])
@@ -89,7 +99,11 @@ def main():
             # Get response
             with st.spinner("Thinking..."):
                 response = answer_question(
-                    qa_chain, prompt, st.session_state.chat_history
+                    qa_chain,
+                    prompt,
+                    history_for_chain(
+                        st.session_state.chat_history, st.session_state.chat_summary
+                    ),
                 )
 
             with st.chat_message("assistant"):
@@ -98,14 +112,23 @@ def main():
                     unsafe_allow_html=True,
                 )
 
-            # Update chat history
+            # Update chat history, folding older turns into the summary
             st.session_state.chat_history.append((prompt, response))
+            (
+                st.session_state.chat_history,
+                st.session_state.chat_summary,
+            ) = fold_history(
+                st.session_state.chat_history,
+                st.session_state.chat_summary,
+                st.session_state.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY"),
+            )
 
         # Main analysis tabs
         tabs = st.tabs(["Team Analysis", "Player Analysis", "Matchup Insights"])
 
         with tabs[0]:
             render_team_analysis()
+            render_meta_analysis()
 
         with tabs[1]:
             render_player_analysis()
@@ -0,0 +1,108 @@
+"""
+Compare the three-request analysis path with the single "full_draft" request
+
+Calls the OpenAI API directly (bypassing the response cache) and reports
+wall-clock latency and prompt/completion token totals for both paths.
+
+Example:
+
+    OPENAI_API_KEY=sk-... python -m benchmarks.bench_full_draft --rounds 3
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import openai
+
+from utils.openai_utils import build_request
+
+BLUE_TEAM = ["Ornn", "Sejuani", "Orianna", "Jinx", "Thresh"]
+RED_TEAM = ["Gnar", "Vi", "Ahri", "Kai'Sa", "Nautilus"]
+
+
+def _draft_requests(perspective):
+    team = BLUE_TEAM if perspective == "Blue" else RED_TEAM
+    player = {
+        "summoner_name": "Bench Player",
+        "region": "EUW1",
+        "champion": team[2],
+        "role": "Mid",
+    }
+    three_calls = {
+        "team_analysis": {"blue": BLUE_TEAM, "red": RED_TEAM, "side": perspective},
+        "player_analysis": player,
+        "matchup_insights": {"blue": BLUE_TEAM, "red": RED_TEAM, "perspective": perspective},
+    }
+    full_draft = dict(player, blue=BLUE_TEAM, red=RED_TEAM, perspective=perspective)
+    return three_calls, full_draft
+
+
+def _complete(client, analysis_type, data):
+    """Run one completion and return (seconds, prompt tokens, completion tokens)"""
+    start = time.perf_counter()
+    response = client.chat.completions.create(**build_request(analysis_type, data))
+    elapsed = time.perf_counter() - start
+    return elapsed, response.usage.prompt_tokens, response.usage.completion_tokens
+
+
+def _report(name, rounds):
+    walls = [wall for wall, _, _ in rounds]
+    prompt_tokens = statistics.mean(tokens for _, tokens, _ in rounds)
+    completion_tokens = statistics.mean(tokens for _, _, tokens in rounds)
+    print(
+        f"{name:<28} p50 {statistics.median(walls) * 1000:8.0f} ms  max {max(walls) * 1000:8.0f} ms  "
+        f"prompt {prompt_tokens:7.0f}  completion {completion_tokens:7.0f}  "
+        f"total {prompt_tokens + completion_tokens:7.0f} tokens/analysis"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--perspective", choices=["Blue", "Red"], default="Blue")
+    args = parser.parse_args()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        sys.exit("OPENAI_API_KEY is required for this benchmark")
+
+    client = openai.OpenAI(api_key=api_key)
+    three_calls, full_draft = _draft_requests(args.perspective)
+
+    sequential, concurrent, combined = [], [], []
+    for round_number in range(args.rounds):
+        print(f"Round {round_number + 1}/{args.rounds}...")
+
+        start = time.perf_counter()
+        results = [_complete(client, analysis_type, data) for analysis_type, data in three_calls.items()]
+        sequential.append((
+            time.perf_counter() - start,
+            sum(result[1] for result in results),
+            sum(result[2] for result in results),
+        ))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(three_calls)) as pool:
+            results = list(pool.map(lambda item: _complete(client, *item), three_calls.items()))
+        concurrent.append((
+            time.perf_counter() - start,
+            sum(result[1] for result in results),
+            sum(result[2] for result in results),
+        ))
+
+        combined.append(_complete(client, "full_draft", full_draft))
+
+    print()
+    _report("three calls, sequential", sequential)
+    _report("three calls, concurrent", concurrent)
+    _report("single full_draft call", combined)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Measure the cold import time of the Streamlit app against a startup budget
+
+Imports app.py (which renders nothing outside `streamlit run`) in fresh
+interpreters, reports the median time, and checks that the heavy AI/LLM
+packages are not loaded on the way to the welcome page. Exits non-zero when
+the budget is exceeded or a deferred package was imported.
+
+Example:
+
+    python -m benchmarks.bench_import_time --runs 5 --budget-ms 1500
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Keep app.py from starting the networked cache warmup thread in every probe
+PROBE_ENV = dict(os.environ, WARMUP_ENABLED="0")
+
+# Packages that must only load on first use, not at app start
+DEFERRED_PACKAGES = ("openai", "langchain", "langchain_community", "langchain_core", "faiss", "google.generativeai")
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [name for name in {deferred!r} if name in sys.modules]}}))
+"""
+
+
+def _run_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(deferred=DEFERRED_PACKAGES)],
+        cwd=ROOT,
+        env=PROBE_ENV,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"import app failed:\n{result.stderr}")
+    # Streamlit may log warnings about running without `streamlit run`; the result is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _top_imports(count):
+    """Slowest direct imports of app.py (cumulative), from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        env=PROBE_ENV,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    # Children are printed before their parent, so collect level-one rows until the "app" row
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Each nesting level is indented by two more spaces
+        name = parts[2]
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if level == 0:
+            if name.strip() == "app":
+                break
+            rows = []
+        elif level == 1:
+            rows.append((int(parts[1]), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum median import time of app.py")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports made by app.py")
+    args = parser.parse_args()
+
+    runs = [_run_once() for _ in range(args.runs)]
+    timings = [run["elapsed"] * 1000 for run in runs]
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    median = statistics.median(timings)
+
+    print(f"import app: median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms over {args.runs} runs")
+    if args.top:
+        print("Slowest imports made by app.py:")
+        for cumulative, name in _top_imports(args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: deferred packages imported at startup: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median {median:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"OK: within the {args.budget_ms:.0f} ms budget and no deferred packages loaded")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
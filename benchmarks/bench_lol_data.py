@@ -0,0 +1,88 @@
+"""
+Load test for the utils/lol_data.py fetch paths against the local stand-in
+
+Example:
+
+    python -m benchmarks.bench_lol_data --latency-ms 80 --jitter-ms 20 --users 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.riot_standin import StandinConfig, start_standin, standin_env
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--app-rate-limit", default="20:1,100:120", help="App limit the stand-in enforces (development key by default)")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent distinct summoners")
+    parser.add_argument("--region", default="EUW1")
+    args = parser.parse_args()
+
+    server = start_standin(config=StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429_rate=args.error_429_rate,
+        enforce_limits=True,
+        app_rate_limit=args.app_rate_limit,
+    ))
+    stats = server.stats
+
+    # Base URLs and the cache directory are read at import time
+    os.environ.update(standin_env(server))
+    os.environ["DRAFTMASTER_CACHE_DIR"] = tempfile.mkdtemp(prefix="draftmaster-bench-")
+    os.environ["RIOT_API_KEY"] = "RGAPI-standin"
+
+    from utils import lol_data
+
+    print(
+        f"Stand-in latency {args.latency_ms:.0f}ms +/- {args.jitter_ms:.0f}ms, "
+        f"429 rate {args.error_429_rate:.0%}, app limit {args.app_rate_limit}"
+    )
+
+    champions, elapsed = _timed(lol_data.load_champion_list)
+    print(f"load_champion_list cold:      {elapsed * 1000:8.1f} ms  {len(champions)} champions, {stats.total('/ddragon')} Data Dragon requests")
+    stats.reset()
+    _, elapsed = _timed(lol_data.load_champion_list)
+    print(f"load_champion_list warm:      {elapsed * 1000:8.1f} ms  {stats.total('/ddragon')} Data Dragon requests")
+
+    stats.reset()
+    profile, elapsed = _timed(lol_data.get_summoner_data, "Bench Player", args.region)
+    print(f"get_summoner_data cold:       {elapsed * 1000:8.1f} ms  {len(profile.get('recentMatches', []))} matches, {stats.total('/riot')} Riot requests")
+    stats.reset()
+    _, elapsed = _timed(lol_data.get_summoner_data, "Bench Player", args.region)
+    print(f"get_summoner_data rerun:      {elapsed * 1000:8.1f} ms  {stats.total('/riot')} Riot requests")
+
+    stats.reset()
+    names = [f"Bench User {i}" for i in range(args.users)]
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        start = time.perf_counter()
+        timings = list(pool.map(lambda name: _timed(lol_data.get_summoner_data, name, args.region)[1], names))
+        wall = time.perf_counter() - start
+    print(
+        f"get_summoner_data x{args.users} users: {wall * 1000:8.1f} ms wall, "
+        f"p50 {statistics.median(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms, "
+        f"{stats.total('/riot')} Riot requests, {stats.throttled} throttled"
+    )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
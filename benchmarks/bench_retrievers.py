@@ -0,0 +1,124 @@
+"""
+Compare the FAISS and BM25 chat retrievers on a sample analysis
+
+Reports index build time, per-question retrieval latency, how often the
+retrieved context contains the fact a question is about (recall), and how much
+context is handed to the LLM. With --answers it also runs the full chat chain
+through OpenAI and checks whether each answer mentions that fact.
+
+FAISS needs an embedding backend: sentence-transformers installed locally, or
+OPENAI_API_KEY for the openai backend. Without either, only BM25 is measured.
+
+Example:
+
+    python -m benchmarks.bench_retrievers
+    OPENAI_API_KEY=sk-... python -m benchmarks.bench_retrievers --answers
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.langchain_utils import build_retriever
+from utils.embeddings import resolve_embedding_backend
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "analysis" / "sample_analysis.json"
+
+# Question and a phrase the relevant analysis fact contains
+QUESTIONS = [
+    ("What are our win conditions?", "Dragon soul"),
+    ("How do we beat their split pushers?", "split pushers"),
+    ("How should I play the mid lane against Ahri?", "Hold Shockwave"),
+    ("What items should I build?", "Zhonya's Hourglass"),
+    ("How do I avoid dying to Vi ganks?", "river brush"),
+    ("Is the bot lane matchup favorable for Jinx?", "Kai'Sa out-trades Jinx"),
+    ("What should Thresh do against Nautilus?", "flay"),
+    ("How do we deal with Gnar top?", "Gnar hop range"),
+    ("When is our team strongest?", "8/10"),
+    ("What CS should I aim for?", "8 CS per minute"),
+]
+
+
+def _retrieve(retriever, question):
+    start = time.perf_counter()
+    documents = retriever.get_relevant_documents(question)
+    return documents, time.perf_counter() - start
+
+
+def _bench_retriever(kind, analysis_data, api_key, builds):
+    build_times = []
+    for _ in range(builds):
+        start = time.perf_counter()
+        retriever = build_retriever(analysis_data, api_key, kind)
+        build_times.append(time.perf_counter() - start)
+
+    latencies, hits, context_chars = [], 0, []
+    for question, expected in QUESTIONS:
+        documents, elapsed = _retrieve(retriever, question)
+        latencies.append(elapsed)
+        context = "\n".join(document.page_content for document in documents)
+        context_chars.append(len(context))
+        hits += expected.lower() in context.lower()
+
+    print(
+        f"{kind:<6} build first {build_times[0] * 1000:8.1f} ms, median {statistics.median(build_times) * 1000:8.1f} ms  "
+        f"retrieve p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+        f"recall {hits}/{len(QUESTIONS)}  context {statistics.mean(context_chars):6.0f} chars/question"
+    )
+    return retriever
+
+
+def _bench_answers(kind, retriever, api_key):
+    from langchain.chains import ConversationalRetrievalChain
+    from langchain_community.chat_models import ChatOpenAI
+
+    chain = ConversationalRetrievalChain.from_llm(
+        llm=ChatOpenAI(temperature=0.0, openai_api_key=api_key),
+        retriever=retriever
+    )
+    latencies, hits = [], 0
+    for question, expected in QUESTIONS:
+        start = time.perf_counter()
+        answer = chain({"question": question, "chat_history": []})["answer"]
+        latencies.append(time.perf_counter() - start)
+        hits += expected.lower() in answer.lower()
+    print(
+        f"{kind:<6} answers p50 {statistics.median(latencies) * 1000:8.0f} ms  "
+        f"mention the expected fact {hits}/{len(QUESTIONS)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--builds", type=int, default=5, help="Index builds to time per retriever")
+    parser.add_argument("--answers", action="store_true", help="Also answer the questions through OpenAI")
+    args = parser.parse_args()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    with open(FIXTURE, encoding="utf-8") as f:
+        analysis_data = json.load(f)
+
+    kinds = ["faiss", "bm25"]
+    if resolve_embedding_backend() == "openai" and not api_key:
+        print("Skipping faiss: install sentence-transformers or set OPENAI_API_KEY to embed the analysis\n")
+        kinds.remove("faiss")
+
+    retrievers = {}
+    for kind in kinds:
+        retrievers[kind] = _bench_retriever(kind, analysis_data, api_key, args.builds)
+
+    if args.answers:
+        if not api_key:
+            sys.exit("OPENAI_API_KEY is required for --answers")
+        print()
+        for kind, retriever in retrievers.items():
+            _bench_answers(kind, retriever, api_key)
+
+
+if __name__ == "__main__":
+    main()
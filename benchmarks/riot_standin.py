@@ -0,0 +1,319 @@
+"""
+Local stand-in for the Riot API and Data Dragon, for offline benchmarking
+
+Replays the recorded responses in benchmarks/fixtures with configurable
+latency, jitter and 429 injection. Point the app at it with:
+
+    RIOT_API_URL_TEMPLATE=http://127.0.0.1:8765/riot/{host}
+    DDRAGON_BASE_URL=http://127.0.0.1:8765/ddragon
+
+Run it standalone with `python -m benchmarks.riot_standin --latency-ms 80`.
+"""
+import re
+import json
+import time
+import zlib
+import random
+import struct
+import hashlib
+import argparse
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Matches served per player; newest first, one game every two hours
+MATCHES_PER_PLAYER = 100
+MATCH_INTERVAL_MS = 2 * 60 * 60 * 1000
+LATEST_GAME_CREATION = 1705000000000
+
+APP_RATE_LIMIT = "20:1,100:120"
+METHOD_RATE_LIMIT = "2000:60"
+
+
+def _load_fixture(group: str, name: str) -> Any:
+    with open(FIXTURES_DIR / group / f"{name}.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _render(template: Any, values: Dict[str, Any]) -> Any:
+    """Fill "{placeholder}" strings in a fixture, keeping the value's type for exact matches"""
+    if isinstance(template, dict):
+        return {key: _render(value, values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_render(value, values) for value in template]
+    if isinstance(template, str) and "{" in template:
+        exact = re.fullmatch(r"\{(\w+)\}", template)
+        if exact and exact.group(1) in values:
+            return values[exact.group(1)]
+        return template.format_map(defaultdict(str, values))
+    return template
+
+
+def _png(width: int, height: int) -> bytes:
+    """Build a solid-colour PNG so sprite sheets and icons have real dimensions"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\x00" + b"\x2a\x5c\x8a" * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _player_values(summoner_name: str = "", puuid: str = "") -> Dict[str, Any]:
+    """Stable fake IDs so every summoner name maps to its own player"""
+    if not puuid:
+        puuid = "puuid-" + hashlib.sha1(summoner_name.lower().encode("utf-8")).hexdigest()
+    if not summoner_name:
+        summoner_name = "Player " + puuid[-6:]
+    return {
+        "puuid": puuid,
+        "summoner_id": "sid-" + puuid[-24:],
+        "account_id": "aid-" + puuid[-24:],
+        "summoner_name": summoner_name,
+    }
+
+
+class StandinConfig:
+    """Latency, jitter and failure injection settings"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_429_rate: float = 0.0,
+        retry_after: int = 1,
+        enforce_limits: bool = False,
+        app_rate_limit: str = APP_RATE_LIMIT,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429_rate = error_429_rate
+        self.retry_after = retry_after
+        self.enforce_limits = enforce_limits
+        self.app_rate_limit = app_rate_limit
+        self.app_limits = [
+            (int(count), int(seconds))
+            for count, seconds in (part.split(":") for part in app_rate_limit.split(","))
+        ]
+
+
+class StandinStats:
+    """Request counters, so benchmarks can assert how many calls a code path made"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.throttled = 0
+        self._app_windows: Dict[str, deque] = defaultdict(deque)
+
+    def total(self, prefix: str = "") -> int:
+        with self.lock:
+            return sum(count for path, count in self.requests.items() if path.startswith(prefix))
+
+    def reset(self):
+        with self.lock:
+            self.requests.clear()
+            self.throttled = 0
+
+    def app_counts(self, host: str, limits: list, now: float) -> Tuple[str, bool]:
+        """Record a request against the host's app limits; return the count header and whether it is over"""
+        longest = max(seconds for _, seconds in limits)
+        with self.lock:
+            window = self._app_windows[host]
+            window.append(now)
+            while window and now - window[0] >= longest:
+                window.popleft()
+            counts = [(sum(1 for t in window if now - t < seconds), limit, seconds) for limit, seconds in limits]
+            over = any(count > limit for count, limit, _ in counts)
+            return ",".join(f"{count}:{seconds}" for count, _, seconds in counts), over
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "RiotStandin/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def do_GET(self):
+        config: StandinConfig = self.server.config
+        stats: StandinStats = self.server.stats
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        with stats.lock:
+            stats.requests[path] += 1
+
+        # Simulated network latency
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if path.startswith("/ddragon/"):
+            self._serve_ddragon(path[len("/ddragon"):])
+        elif path.startswith("/riot/"):
+            self._serve_riot(path[len("/riot/"):], query)
+        else:
+            self._send_json({"status": {"status_code": 404, "message": "Not found"}}, 404)
+
+    def _serve_ddragon(self, path: str):
+        if path == "/api/versions.json":
+            return self._send_json(_load_fixture("ddragon", "versions"))
+
+        match = re.fullmatch(r"/cdn/[^/]+/data/[^/]+/(champion|item|summoner)\.json", path)
+        if match:
+            return self._send_json(_load_fixture("ddragon", match.group(1)))
+
+        if re.fullmatch(r"/cdn/[^/]+/img/sprite/[^/]+\.png", path):
+            return self._send_bytes(_png(480, 48), "image/png")
+        if re.fullmatch(r"/cdn/[^/]+/img/champion/[^/]+\.png", path):
+            return self._send_bytes(_png(120, 120), "image/png")
+
+        self._send_json({"status": {"status_code": 404, "message": "Not found"}}, 404)
+
+    def _serve_riot(self, path: str, query: Dict[str, str]):
+        config: StandinConfig = self.server.config
+        host, _, endpoint = path.partition("/")
+        endpoint = "/" + endpoint
+
+        count_header, over_limit = self.server.stats.app_counts(host, config.app_limits, time.monotonic())
+        headers = {
+            "X-App-Rate-Limit": config.app_rate_limit,
+            "X-App-Rate-Limit-Count": count_header,
+            "X-Method-Rate-Limit": METHOD_RATE_LIMIT,
+        }
+
+        if (config.enforce_limits and over_limit) or random.random() < config.error_429_rate:
+            with self.server.stats.lock:
+                self.server.stats.throttled += 1
+            headers.update({"Retry-After": str(config.retry_after), "X-Rate-Limit-Type": "application"})
+            return self._send_json({"status": {"status_code": 429, "message": "Rate limit exceeded"}}, 429, headers)
+
+        body = self._riot_body(endpoint, query)
+        if body is None:
+            return self._send_json({"status": {"status_code": 404, "message": "Data not found"}}, 404, headers)
+        self._send_json(body, 200, headers)
+
+    def _riot_body(self, endpoint: str, query: Dict[str, str]) -> Optional[Any]:
+        match = re.fullmatch(r"/lol/summoner/v4/summoners/by-name/(.+)", endpoint)
+        if match:
+            return _render(_load_fixture("riot", "summoner"), _player_values(summoner_name=match.group(1)))
+
+        match = re.fullmatch(r"/lol/summoner/v4/summoners/by-puuid/(.+)", endpoint)
+        if match:
+            return _render(_load_fixture("riot", "summoner"), _player_values(puuid=match.group(1)))
+
+        match = re.fullmatch(r"/lol/league/v4/entries/by-summoner/(.+)", endpoint)
+        if match:
+            return _render(_load_fixture("riot", "league"), {"summoner_id": match.group(1)})
+
+        match = re.fullmatch(r"/lol/champion-mastery/v4/champion-masteries/by-puuid/([^/]+)/top", endpoint)
+        if match:
+            masteries = _render(_load_fixture("riot", "mastery"), {"puuid": match.group(1)})
+            return masteries[:int(query.get("count", 3))]
+
+        match = re.fullmatch(r"/lol/match/v5/matches/by-puuid/([^/]+)/ids", endpoint)
+        if match:
+            return self._match_ids(match.group(1), query)
+
+        match = re.fullmatch(r"/lol/match/v5/matches/(\w+)_(\w+)_(\d+)", endpoint)
+        if match:
+            platform, player_tag, number = match.groups()
+            return _render(_load_fixture("riot", "match"), {
+                "match_id": f"{platform}_{player_tag}_{number}",
+                "puuid": "puuid-" + player_tag,
+                "summoner_name": "Player " + player_tag[-6:],
+                "game_creation": LATEST_GAME_CREATION - int(number) * MATCH_INTERVAL_MS,
+            })
+
+        return None
+
+    def _match_ids(self, puuid: str, query: Dict[str, str]) -> list:
+        # Match IDs encode the player and the game number so match details can be rebuilt
+        player_tag = puuid[len("puuid-"):] if puuid.startswith("puuid-") else puuid
+        start = int(query.get("start", 0))
+        count = int(query.get("count", 20))
+        start_time_ms = int(query["startTime"]) * 1000 if "startTime" in query else None
+
+        match_ids = []
+        for number in range(start, MATCHES_PER_PLAYER):
+            if start_time_ms is not None and LATEST_GAME_CREATION - number * MATCH_INTERVAL_MS < start_time_ms:
+                break
+            match_ids.append(f"EUW1_{player_tag}_{number}")
+            if len(match_ids) == count:
+                break
+        return match_ids
+
+    def _send_json(self, body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        self._send_bytes(json.dumps(body).encode("utf-8"), "application/json;charset=utf-8", status, headers)
+
+    def _send_bytes(self, body: bytes, content_type: str, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_standin(host: str = "127.0.0.1", port: int = 0, config: Optional[StandinConfig] = None) -> ThreadingHTTPServer:
+    """Start the stand-in in a background thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.config = config or StandinConfig()
+    server.stats = StandinStats()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def standin_env(server: ThreadingHTTPServer) -> Dict[str, str]:
+    """Environment variables that point utils/lol_data.py at a running stand-in"""
+    host, port = server.server_address[:2]
+    return {
+        "RIOT_API_URL_TEMPLATE": f"http://{host}:{port}/riot/{{host}}",
+        "DDRAGON_BASE_URL": f"http://{host}:{port}/ddragon",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random +/- variation on the latency")
+    parser.add_argument("--error-429-rate", type=float, default=0.0, help="Fraction of Riot requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--app-rate-limit", default=APP_RATE_LIMIT, help="App limit to advertise, e.g. 500:10,30000:600")
+    parser.add_argument("--enforce-limits", action="store_true", help="Answer 429 once the app limit is exceeded")
+    args = parser.parse_args()
+
+    server = start_standin(args.host, args.port, StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429_rate=args.error_429_rate,
+        retry_after=args.retry_after,
+        enforce_limits=args.enforce_limits,
+        app_rate_limit=args.app_rate_limit,
+    ))
+    for key, value in standin_env(server).items():
+        print(f"{key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,32 @@
 import streamlit as st
-from utils.gemini_api import GeminiMetaAnalyzer, VideoContentFetcher
-from utils.lol_data import get_champion_icon_url
+from utils.gemini_api import GeminiMetaAnalyzer, get_video_feed
+from utils.ddragon import get_latest_version
+from utils.lol_data import get_champion_icon_html
+
+def get_welcome_video_feed():
+    """Get the shared video feed for the current patch (one YouTube search per TTL for all sessions)"""
+    try:
+        patch_version = get_latest_version()
+    except Exception:
+        patch_version = st.session_state.get('current_patch_analysis', {}).get('version', '14.1')
+    
+    return get_video_feed(
+        patch_version,
+        st.session_state.get("YOUTUBE_API_KEY"),
+        st.session_state.get("GEMINI_API_KEY")
+    )
 
 def render_enhanced_welcome():
     """Render enhanced welcome page with AI-powered patch analysis and autoplay patch video"""
     
     # --- Autoplay Patch Video Section ---
     st.markdown("### 🎬 Latest Patch Video (Autoplay)")
-    # Try to get the latest patch version from session state, fallback to '14.1'
-    patch_version = st.session_state.get('current_patch_analysis', {}).get('version', '14.1')
-    video_fetcher = VideoContentFetcher(st.session_state.get("YOUTUBE_API_KEY"))
-    videos = video_fetcher.get_patch_videos(patch_version)
-    if videos:
+    # One feed serves both the autoplay embed and the featured videos grid
+    video_feed = get_welcome_video_feed()
+    if video_feed.top_video:
         # Extract video ID from the URL
         import re
-        video_url = videos[0]['url']
+        video_url = video_feed.top_video['url']
         match = re.search(r"v=([\w-]+)", video_url)
         video_id = match.group(1) if match else None
         if video_id:
@@ -38,7 +50,7 @@ def render_enhanced_welcome():
     
     # Always show patch section and videos (with fallback data if no API key)
     render_latest_patch_section()
-    render_featured_videos_section()
+    render_featured_videos_section(video_feed)
     render_trending_champions_section()
     
     # Original Features Grid
@@ -102,21 +114,21 @@ def render_latest_patch_section():
     # Store patch analysis in session state for other components
     st.session_state.current_patch_analysis = patch_analysis
 
-def render_featured_videos_section():
+def render_featured_videos_section(video_feed=None):
     """Render featured patch videos section"""
     st.markdown("### 📺 Featured Patch Videos")
     
     try:
-        # Get current patch version
-        patch_version = st.session_state.get('current_patch_analysis', {}).get('version', '14.1')
-        
         # Fetch videos (will use fallback if no YouTube API key)
-        video_fetcher = VideoContentFetcher(st.session_state.get("YOUTUBE_API_KEY"))
-        videos = video_fetcher.get_patch_videos(patch_version)
+        if video_feed is None:
+            video_feed = get_welcome_video_feed()
+        
+        if video_feed.error:
+            st.error(f"Error fetching YouTube videos: {video_feed.error}")
         
         # Display videos in grid
         video_cols = st.columns(3)
-        for i, video in enumerate(videos[:3]):
+        for i, video in enumerate(video_feed.grid):
             with video_cols[i]:
                 st.markdown(f"""
                 <div class="video-card">
@@ -131,10 +143,10 @@ def render_featured_videos_section():
                 """, unsafe_allow_html=True)
         
         # Show more videos button
-        if len(videos) > 3:
+        if video_feed.more:
             with st.expander("🎬 View More Videos"):
                 more_video_cols = st.columns(3)
-                for i, video in enumerate(videos[3:6]):
+                for i, video in enumerate(video_feed.more):
                     with more_video_cols[i]:
                         st.markdown(f"""
                         <div class="video-card-small">
@@ -172,10 +184,10 @@ def render_trending_champions_section():
                         champ_cols = st.columns(len(champions))
                         for j, champion in enumerate(champions):
                             with champ_cols[j]:
-                                icon_url = get_champion_icon_url(champion)
+                                icon_html = get_champion_icon_html(champion, 60, css_class="champion-icon-trending")
                                 st.markdown(f"""
                                 <div class="trending-champion">
-                                    <img src="{icon_url}" class="champion-icon-trending" alt="{champion}">
+                                    {icon_html}
                                     <p class="champion-name">{champion}</p>
                                     <span class="trending-badge">🔥 Trending</span>
                                 </div>
@@ -1,16 +1,21 @@
 import streamlit as st
-from utils.lol_data import get_champion_icon_url
+from utils.lol_data import get_champion_icon_html
 
-def render_matchup_insights():
-    """Render the matchup insights section"""
+def render_matchup_insights(matchup_insights=None):
+    """Render the matchup insights section (pass partial insights to preview streaming ones)"""
     
     # Get analysis data
-    matchup_insights = st.session_state.analysis_results.get("matchup_insights", {})
+    if matchup_insights is None:
+        matchup_insights = st.session_state.analysis_results.get("matchup_insights", {})
     
     if not matchup_insights:
         st.warning("Matchup insights data is not available.")
         return
     
+    if "error" in matchup_insights:
+        st.error(matchup_insights["error"])
+        return
+    
     # Matchup header
     st.markdown(
         """
@@ -39,11 +44,11 @@ def render_matchup_insights():
     
     for champion in blue_team:
         if champion:
-            icon_url = get_champion_icon_url(champion)
+            icon_html = get_champion_icon_html(champion, 48, style="border: 2px solid #5383E8;")
             st.markdown(
                 f"""
                 <div style="margin: 10px 0;">
-                    <img src="{icon_url}" width="48" height="48" class="champion-icon" style="border: 2px solid #5383E8;" alt="{champion}">
+                    {icon_html}
                 </div>
                 """,
                 unsafe_allow_html=True
@@ -72,11 +77,11 @@ def render_matchup_insights():
     
     for champion in red_team:
         if champion:
-            icon_url = get_champion_icon_url(champion)
+            icon_html = get_champion_icon_html(champion, 48, style="border: 2px solid #E84057;")
             st.markdown(
                 f"""
                 <div style="margin: 10px 0;">
-                    <img src="{icon_url}" width="48" height="48" class="champion-icon" style="border: 2px solid #E84057;" alt="{champion}">
+                    {icon_html}
                 </div>
                 """,
                 unsafe_allow_html=True
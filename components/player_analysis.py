@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.lol_data import get_summoner_data, get_champion_icon_url
+from utils.lol_data import get_summoner_data, get_champion_icon_html
 
 def render_player_analysis():
     """Render the player analysis section"""
@@ -11,6 +11,10 @@ def render_player_analysis():
         st.warning("Player analysis data is not available.")
         return
     
+    if "error" in player_analysis:
+        st.error(player_analysis["error"])
+        return
+    
     # Get summoner data
     summoner_name = st.session_state.get("summoner_name", "")
     region = st.session_state.get("region", "NA1")
@@ -78,12 +82,12 @@ def render_player_analysis():
         top_champions = summoner_data.get('topChampions', [])
         if top_champions:
             for champion in top_champions[:3]:
-                icon_url = get_champion_icon_url(champion)
-                if icon_url:  # Only show if we got a valid icon URL
+                icon_html = get_champion_icon_html(champion, 24, style="margin-right: 10px;")
+                if icon_html:  # Only show if we got a valid icon
                     st.markdown(
                         f"""
                         <div style="display: flex; align-items: center; margin: 5px 0;">
-                            <img src="{icon_url}" width="24" height="24" class="champion-icon" style="margin-right: 10px;">
+                            {icon_html}
                             <span>{champion}</span>
                         </div>
                         """,
@@ -100,6 +104,13 @@ def render_player_analysis():
     recent_matches = summoner_data.get('recentMatches', [])
     
     if recent_matches:
+        # Record over every fetched match, not just the cards shown below
+        wins = sum(1 for match in recent_matches if match.get('result') == "Victory")
+        st.markdown(
+            f"<p>Last {len(recent_matches)} games: {wins}W / {len(recent_matches) - wins}L</p>",
+            unsafe_allow_html=True
+        )
+        
         # Create a row for recent matches
         match_cols = st.columns(len(recent_matches[:5]))  # Limit to 5 matches
         
@@ -109,13 +120,15 @@ def render_player_analysis():
                 result_color = "var(--success-color)" if match.get('result') == "Victory" else "var(--danger-color)"
                 
                 # Get champion icon
-                icon_url = get_champion_icon_url(match.get('champion', ''))
+                icon_html = get_champion_icon_html(
+                    match.get('champion', ''), 40, css_class="", style="border-radius: 50%; margin-bottom: 5px;"
+                )
                 
                 st.markdown(
                     f"""
                     <div style="text-align: center; padding: 10px; background-color: var(--lol-blue-light); 
                                 border-radius: 5px; border-left: 3px solid {result_color};">
-                        <img src="{icon_url}" width="40" height="40" style="border-radius: 50%; margin-bottom: 5px;">
+                        {icon_html}
                         <p style="margin: 5px 0; font-weight: bold; color: {result_color};">{match.get('result', 'Unknown')}</p>
                         <p>KDA: {match.get('kda', '0/0/0')}</p>
                         <p>CS: {match.get('cs', '0')}</p>
@@ -152,13 +165,15 @@ def render_player_analysis():
         return
     
     # Champion analysis header
-    icon_url = get_champion_icon_url(player_champion)
+    icon_html = get_champion_icon_html(
+        player_champion, 64, css_class="", style="border-radius: 50%; margin-right: 15px; border: 2px solid var(--lol-gold);"
+    )
     
-    if icon_url:
+    if icon_html:
         st.markdown(
             f"""
             <div style="display: flex; align-items: center; margin-bottom: 20px;">
-                <img src="{icon_url}" width="64" height="64" style="border-radius: 50%; margin-right: 15px; border: 2px solid var(--lol-gold);">
+                {icon_html}
                 <div>
                     <h3 style="color: var(--lol-gold); margin: 0;">{player_champion} Analysis</h3>
                     <p style="margin: 5px 0 0 0;">Position: {player_position}</p>
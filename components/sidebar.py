@@ -1,10 +1,60 @@
+import os
+import time
 import streamlit as st
 from utils.lol_data import get_regions, load_champion_list, get_champion_roles
-from utils.openai_utils import get_analysis
+from utils.analysis_pipeline import run_analyses, run_full_draft_analysis, draft_fingerprint, MetaAnalysisTask, PROGRESS_INTERVAL
 from utils.session_state import update_team_comp, reset_analysis
+from components.team_analysis import render_team_analysis
+from components.matchup_insights import render_matchup_insights
 
-def render_sidebar():
-    """Render the sidebar for input and controls"""
+def render_analysis_preview(preview, partials):
+    """Render the team and matchup cards that have streamed in so far"""
+    with preview.container():
+        st.markdown("<h2 style='color: var(--lol-gold);'>Generating Analysis...</h2>", unsafe_allow_html=True)
+        tabs = st.tabs(["Team Analysis", "Matchup Insights"])
+        
+        with tabs[0]:
+            if partials.get("team_analysis"):
+                render_team_analysis(partials["team_analysis"])
+            else:
+                st.info("Waiting for the first team insights...")
+        
+        with tabs[1]:
+            if partials.get("matchup_insights"):
+                render_matchup_insights(partials["matchup_insights"])
+            else:
+                st.info("Waiting for the first lane insights...")
+
+def cancel_stale_meta_analysis(current_draft):
+    """Cancel a meta analysis still running for a draft the user has since changed"""
+    meta_task = st.session_state.get("meta_analysis_task")
+    if meta_task is not None and meta_task.fingerprint != current_draft:
+        # Forget the task first so a failing cancel cannot leave it behind for every rerun
+        st.session_state.meta_analysis_task = None
+        meta_task.cancel()
+
+def wait_for_meta_analysis(meta_task):
+    """
+    Wait for the meta analysis while updating the page, so Streamlit can still
+    stop the script (and the except below cancel the task) if the draft changes
+    """
+    status = st.empty()
+    while not meta_task.done():
+        elapsed = time.monotonic() - meta_task.started
+        if elapsed >= meta_task.deadline:
+            break
+        status.caption(f"Waiting for the meta analysis... {elapsed:.0f}s")
+        time.sleep(PROGRESS_INTERVAL)
+    status.empty()
+    return meta_task.result(timeout=0)
+
+def render_sidebar(preview=None):
+    """
+    Render the sidebar for input and controls
+    
+    Args:
+        preview: Optional main-area placeholder where analysis cards are shown while they stream in
+    """
     with st.sidebar:
         st.markdown("<h2 style='color: #C89B3C;'>Input Details</h2>", unsafe_allow_html=True)
         
@@ -40,10 +90,10 @@ def render_sidebar():
             st.markdown("#### Blue Side")
             for i, position in enumerate(positions):
                 # Filter champions by position
-                position_champions = roles_map.get(position, champion_list)
+                position_champions = roles_map.get(position) or tuple(champion_list)
                 
                 # Add empty option first
-                position_champions = [""] + position_champions
+                position_champions = ("",) + position_champions
                 
                 # Get current value
                 current_value = st.session_state.team_comp["blue"][i] if i < len(st.session_state.team_comp["blue"]) else ""
@@ -69,10 +119,10 @@ def render_sidebar():
             st.markdown("#### Red Side")
             for i, position in enumerate(positions):
                 # Filter champions by position
-                position_champions = roles_map.get(position, champion_list)
+                position_champions = roles_map.get(position) or tuple(champion_list)
                 
                 # Add empty option first
-                position_champions = [""] + position_champions
+                position_champions = ("",) + position_champions
                 
                 # Get current value
                 current_value = st.session_state.team_comp["red"][i] if i < len(st.session_state.team_comp["red"]) else ""
@@ -103,6 +153,17 @@ def render_sidebar():
             key="perspective"
         )
         
+        full_draft_mode = st.checkbox(
+            "Single-request analysis",
+            value=False,
+            key="full_draft_mode",
+            help="Ask for team, player and matchup analysis in one combined request instead of three"
+        )
+        
+        # The draft may have changed while an analysis was running
+        current_draft = draft_fingerprint(st.session_state.team_comp, perspective)
+        cancel_stale_meta_analysis(current_draft)
+        
         # Analyze button
         if st.button("Generate Analysis", type="primary"):
             with st.spinner("Generating comprehensive analysis..."):
@@ -122,14 +183,6 @@ def render_sidebar():
                     st.error("Please enter your summoner name.")
                     return
                 
-                # Get team analysis
-                team_analysis = get_analysis("team_analysis", {
-                    "blue": blue_team,
-                    "red": red_team,
-                    "side": perspective
-                })
-                
-                # Get player analysis
                 # Find the champion played by the summoner
                 player_position = positions[0]  # Default to top
                 player_champion = blue_team[0]  # Default to top champion
@@ -143,26 +196,69 @@ def render_sidebar():
                         player_position = position
                         player_champion = red_team[i]
                 
-                player_analysis = get_analysis("player_analysis", {
-                    "summoner_name": summoner_name,
-                    "region": region,
-                    "champion": player_champion,
-                    "role": player_position
-                })
-                
-                # Get matchup insights
-                matchup_insights = get_analysis("matchup_insights", {
-                    "blue": blue_team,
-                    "red": red_team,
-                    "perspective": perspective
-                })
-                
-                # Store results
-                st.session_state.analysis_results = {
-                    "team_analysis": team_analysis,
-                    "player_analysis": player_analysis,
-                    "matchup_insights": matchup_insights
-                }
+                api_key = st.session_state.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+                
+                # Meta-aware team analysis on Gemini runs alongside the OpenAI analyses
+                gemini_api_key = st.session_state.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+                meta_task = None
+                if gemini_api_key:
+                    meta_task = MetaAnalysisTask(current_draft, st.session_state.team_comp, perspective, gemini_api_key)
+                    st.session_state.meta_analysis_task = meta_task
+                
+                # Stream the cards into the main area when a preview placeholder is available
+                on_progress = None
+                if preview is not None:
+                    on_progress = lambda partials: render_analysis_preview(preview, partials)
+                
+                # Store results (sections that failed or timed out carry an "error")
+                try:
+                    if full_draft_mode:
+                        # One combined request returning all three sections
+                        st.session_state.analysis_results = run_full_draft_analysis({
+                            "blue": blue_team,
+                            "red": red_team,
+                            "perspective": perspective,
+                            "summoner_name": summoner_name,
+                            "region": region,
+                            "champion": player_champion,
+                            "role": player_position
+                        }, api_key, on_progress=on_progress)
+                    else:
+                        # Team, player and matchup analyses run concurrently
+                        st.session_state.analysis_results = run_analyses({
+                            "team_analysis": {
+                                "blue": blue_team,
+                                "red": red_team,
+                                "side": perspective
+                            },
+                            "player_analysis": {
+                                "summoner_name": summoner_name,
+                                "region": region,
+                                "champion": player_champion,
+                                "role": player_position
+                            },
+                            "matchup_insights": {
+                                "blue": blue_team,
+                                "red": red_team,
+                                "perspective": perspective
+                            }
+                        }, api_key, on_progress=on_progress)
+                    
+                    meta_analysis = wait_for_meta_analysis(meta_task) if meta_task is not None else None
+                except BaseException:
+                    # Streamlit stops the script when the draft changes mid-run
+                    if meta_task is not None:
+                        meta_task.cancel()
+                    raise
+                
+                if meta_task is not None:
+                    st.session_state.meta_analysis_task = None
+                    # Never attach a meta analysis to a draft it was not made for
+                    if meta_task.fingerprint == draft_fingerprint(st.session_state.team_comp, perspective):
+                        st.session_state.analysis_results["meta_analysis"] = meta_analysis
+                
+                if preview is not None:
+                    preview.empty()
                 
                 # Set analysis performed flag
                 st.session_state.analysis_performed = True
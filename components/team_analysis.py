@@ -1,16 +1,21 @@
 import streamlit as st
-from utils.lol_data import get_champion_icon_url
+from utils.lol_data import get_champion_icon_html
 
-def render_team_analysis():
-    """Render the team analysis section"""
+def render_team_analysis(team_analysis=None):
+    """Render the team analysis section (pass a partial analysis to preview a streaming one)"""
     
     # Get analysis data
-    team_analysis = st.session_state.analysis_results.get("team_analysis", {})
+    if team_analysis is None:
+        team_analysis = st.session_state.analysis_results.get("team_analysis", {})
     
     if not team_analysis:
         st.warning("Team analysis data is not available.")
         return
     
+    if "error" in team_analysis:
+        st.error(team_analysis["error"])
+        return
+    
     # Team composition overview
     st.markdown(
         """
@@ -30,11 +35,11 @@ def render_team_analysis():
     
     for champion in team_champions:
         if champion:
-            icon_url = get_champion_icon_url(champion)
+            icon_html = get_champion_icon_html(champion, 64)
             st.markdown(
                 f"""
                 <div style="text-align: center; margin: 0 10px;">
-                    <img src="{icon_url}" width="64" height="64" class="champion-icon" alt="{champion}">
+                    {icon_html}
                     <p style="margin-top: 5px; font-size: 0.9rem;">{champion}</p>
                 </div>
                 """,
@@ -236,4 +241,56 @@ def render_team_analysis():
             </div>
             """,
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+
+def render_meta_analysis(meta_analysis=None):
+    """Render the Gemini meta fit of the team, when a meta analysis was run"""
+    
+    if meta_analysis is None:
+        meta_analysis = st.session_state.analysis_results.get("meta_analysis")
+    
+    # Only present when a Gemini API key was configured
+    if not meta_analysis:
+        return
+    
+    st.markdown(
+        """
+        <div style="padding: 20px 0 10px 0;">
+            <h3 style="color: var(--lol-gold);">Current Meta Fit</h3>
+        </div>
+        """, 
+        unsafe_allow_html=True
+    )
+    
+    if "error" in meta_analysis:
+        st.error(meta_analysis["error"])
+        return
+    
+    st.markdown(
+        f"""
+        <div class="insight-card">
+            <h3>Meta Alignment: {meta_analysis.get('meta_alignment', 'N/A')}</h3>
+            <p>Tier in the current meta: {meta_analysis.get('tier_rating', 'Not available')}</p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    
+    col1, col2, col3 = st.columns(3)
+    sections = [
+        (col1, "Meta Strengths", meta_analysis.get('meta_strengths', [])),
+        (col2, "Meta Weaknesses", meta_analysis.get('meta_weaknesses', [])),
+        (col3, "Suggestions", meta_analysis.get('meta_suggestions', [])),
+    ]
+    for column, title, items in sections:
+        with column:
+            items_html = "".join([f"<li>{item}</li>" for item in items]) or "<li>None identified</li>"
+            st.markdown(
+                f"""
+                <div class="insight-card">
+                    <h3>{title}</h3>
+                    <ul>{items_html}</ul>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
@@ -2,6 +2,8 @@ import os
 import requests
 from dotenv import load_dotenv
 
+from utils.riot_client import RiotClient
+
 def get_summoner_info(summoner_name: str, region: str = "euw1"):
     """
     Fetch summoner information from Riot API
@@ -21,26 +23,20 @@ def get_summoner_info(summoner_name: str, region: str = "euw1"):
         print("Please create a .env file with RIOT_API_KEY=your_api_key")
         return None
     
-    # Construct the API URL
-    base_url = f"https://{region}.api.riotgames.com"
-    endpoint = f"/lol/summoner/v4/summoners/by-name/{summoner_name}"
-    url = base_url + endpoint
-    
-    # Set up headers with API key
-    headers = {
-        "X-Riot-Token": api_key
-    }
+    # Pooled, rate-limited client (sends the X-Riot-Token header for us)
+    client = RiotClient(api_key)
     
     try:
-        # Make the API request
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        
-        # Parse and return the JSON response
-        return response.json()
+        # Make the API request and return the parsed JSON response
+        return client.get(
+            region,
+            "/lol/summoner/v4/summoners/by-name/{summoner_name}",
+            summoner_name=summoner_name
+        )
         
     except requests.exceptions.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
+        response = http_err.response
         if response.status_code == 403:
             print("Error 403: Forbidden. Check if your API key is valid and has the correct permissions.")
         elif response.status_code == 404:
@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable, List, Optional
+
+from utils.openai_utils import get_analysis, AnalysisCancelled, FULL_DRAFT_SECTIONS
+
+# Seconds the whole pipeline may take before unfinished sections are reported as timed out
+ANALYSIS_DEADLINE = float(os.getenv("ANALYSIS_DEADLINE", "60"))
+
+# Seconds between progress callbacks while streaming
+PROGRESS_INTERVAL = 0.1
+
+
+def draft_fingerprint(team_comp: Dict[str, List[str]], perspective: str) -> str:
+    """Hash of the draft an analysis run is for, used to detect that the user changed it"""
+    encoded = json.dumps({"team_comp": team_comp, "perspective": perspective}, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def run_analyses(
+    requests: Dict[str, Dict[str, Any]],
+    api_key: Optional[str],
+    deadline: float = ANALYSIS_DEADLINE,
+    on_progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+    cancelled: Optional[threading.Event] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run several analyses concurrently under one shared deadline
+
+    Args:
+        requests: Analysis data keyed by analysis type (e.g. {"team_analysis": {...}})
+        api_key: OpenAI API key, falling back to OPENAI_API_KEY (worker threads
+            cannot read session state, so it is resolved here, never in a worker)
+        deadline: Seconds to wait for all analyses
+        on_progress: Optional callback; when given the completions are streamed
+            and it is called from the calling thread (so it may use Streamlit)
+            with the partial results whenever they change
+        cancelled: Optional event; once set, streaming analyses stop at their
+            next chunk. It is also set when the deadline passes or the calling
+            thread is interrupted (e.g. Streamlit stopping the script on a rerun)
+
+    Returns:
+        dict: Results keyed by analysis type; sections that did not finish in
+        time (or failed) hold an "error" entry, the others hold their analysis
+    """
+    if not requests:
+        return {}
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return {
+            analysis_type: {"error": "OpenAI API key not found. Please set your API key in the sidebar."}
+            for analysis_type in requests
+        }
+
+    if cancelled is None:
+        cancelled = threading.Event()
+
+    # Written by the workers, read by the calling thread
+    partials: Dict[str, Dict[str, Any]] = {}
+
+    def run(analysis_type, data):
+        if cancelled.is_set():
+            raise AnalysisCancelled("Analysis was cancelled.")
+        on_update = None
+        if on_progress is not None:
+            def on_update(partial):
+                if cancelled.is_set():
+                    raise AnalysisCancelled("Analysis was cancelled.")
+                partials[analysis_type] = partial
+        result = get_analysis(analysis_type, data, api_key, deadline, on_update)
+        partials[analysis_type] = result
+        return result
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix="analysis")
+    futures = {
+        analysis_type: executor.submit(run, analysis_type, data)
+        for analysis_type, data in requests.items()
+    }
+
+    pending = set(futures.values())
+    reported = None
+    try:
+        while pending and not cancelled.is_set():
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            timeout = min(PROGRESS_INTERVAL, remaining) if on_progress else remaining
+            _, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if on_progress is not None:
+                snapshot = dict(partials)
+                if snapshot != reported:
+                    reported = snapshot
+                    on_progress(snapshot)
+    except BaseException:
+        # The caller was interrupted: stop the streams instead of paying for unused completions
+        cancelled.set()
+        raise
+    finally:
+        # Do not block on stragglers; streaming ones stop at their next chunk,
+        # the others are ended by their client timeout shortly after the deadline
+        was_cancelled = cancelled.is_set()
+        if pending:
+            cancelled.set()
+        executor.shutdown(wait=False)
+
+    results = {}
+    for analysis_type, future in futures.items():
+        if not future.done():
+            future.cancel()
+            if was_cancelled:
+                results[analysis_type] = {"error": "Analysis was cancelled."}
+            else:
+                results[analysis_type] = {
+                    "error": f"Analysis timed out after {deadline:g} seconds. Please try again."
+                }
+        elif isinstance(future.exception(), AnalysisCancelled):
+            results[analysis_type] = {"error": str(future.exception())}
+        elif future.exception() is not None:
+            results[analysis_type] = {
+                "error": f"Error generating analysis: {str(future.exception())}"
+            }
+        else:
+            results[analysis_type] = future.result()
+    return results
+
+
+def split_full_draft(result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split a (possibly partial) full_draft result into the per-section results"""
+    if "error" in result:
+        return {section: {"error": result["error"]} for section in FULL_DRAFT_SECTIONS}
+    return {
+        section: result[section]
+        for section in FULL_DRAFT_SECTIONS
+        if isinstance(result.get(section), dict)
+    }
+
+
+def run_full_draft_analysis(
+    data: Dict[str, Any],
+    api_key: Optional[str],
+    deadline: float = ANALYSIS_DEADLINE,
+    on_progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+    cancelled: Optional[threading.Event] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get team, player and matchup analysis from a single combined request
+
+    Args:
+        data: Draft, perspective and summoner details (the union of the three analyses' inputs)
+        api_key: OpenAI API key
+        deadline: Seconds to wait for the analysis
+        on_progress: Optional callback, as for run_analyses, called with per-section partials
+        cancelled: Optional event that stops the request, as for run_analyses
+
+    Returns:
+        dict: Results keyed by section, like run_analyses
+    """
+    on_full_progress = None
+    if on_progress is not None:
+        def on_full_progress(partials):
+            on_progress(split_full_draft(partials.get("full_draft", {})))
+
+    result = run_analyses({"full_draft": data}, api_key, deadline, on_full_progress, cancelled)["full_draft"]
+    sections = split_full_draft(result)
+    for section in FULL_DRAFT_SECTIONS:
+        sections.setdefault(section, {"error": "The combined analysis did not include this section. Please try again."})
+    return sections
+
+
+class MetaAnalysisTask:
+    """
+    Gemini meta-aware team analysis running on its own event loop thread, so it
+    overlaps the OpenAI analyses instead of adding to them
+
+    The task is tied to the draft it was started for and can be cancelled from
+    any thread, e.g. when the user changes the draft while it runs.
+    """
+
+    def __init__(
+        self,
+        fingerprint: str,
+        team_comp: Dict[str, List[str]],
+        side: str,
+        gemini_api_key: str,
+        deadline: float = ANALYSIS_DEADLINE
+    ):
+        self.fingerprint = fingerprint
+        self.team_comp = {team: list(champions) for team, champions in team_comp.items()}
+        self.side = side.lower()
+        self.deadline = deadline
+        self._gemini_api_key = gemini_api_key
+        self.started = time.monotonic()
+        self._done = threading.Event()
+        self._cancelled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._result: Dict[str, Any] = {}
+        threading.Thread(target=self._run, name="meta-analysis", daemon=True).start()
+
+    def cancel(self):
+        """Cancel the analysis; the in-flight Gemini request is abandoned. Safe to call at any time"""
+        self._cancelled = True
+        if self._done.is_set():
+            return
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # The loop closed between the check and the call: the task already finished
+                pass
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for the analysis (at most until its deadline, or timeout if given)
+
+        Returns:
+            dict: The meta analysis, or an "error" entry if it failed, timed out or was cancelled
+        """
+        if timeout is None:
+            timeout = max(0.0, self.deadline - (time.monotonic() - self.started))
+        if not self._done.wait(timeout):
+            self.cancel()
+            return {"error": f"Meta analysis timed out after {self.deadline:g} seconds. Please try again."}
+        return self._result
+
+    def _run(self):
+        try:
+            self._result = asyncio.run(self._main())
+        except asyncio.CancelledError:
+            self._result = {"error": "Meta analysis was cancelled."}
+        except asyncio.TimeoutError:
+            self._result = {"error": f"Meta analysis timed out after {self.deadline:g} seconds. Please try again."}
+        except Exception as e:
+            self._result = {"error": f"Error analyzing team with meta: {str(e)}"}
+        finally:
+            self._done.set()
+
+    async def _main(self) -> Dict[str, Any]:
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        # cancel() may have run before the loop existed
+        if self._cancelled:
+            raise asyncio.CancelledError()
+        return await asyncio.wait_for(self._analyze(), self.deadline)
+
+    async def _analyze(self) -> Dict[str, Any]:
+        from utils.gemini_api import GeminiMetaAnalyzer
+
+        analyzer = GeminiMetaAnalyzer(self._gemini_api_key)
+        try:
+            current_meta = await analyzer.get_latest_patch_analysis_async()
+        except Exception:
+            # The team analysis is still useful against the generic meta
+            current_meta = analyzer._get_fallback_analysis()
+        return await analyzer.analyze_team_with_meta_async(self.team_comp, current_meta, self.side)
@@ -0,0 +1,100 @@
+import os
+import re
+import math
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+# Cosine similarity above which two questions are treated as the same question
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+
+# Answers kept per analysis before the least recently used one is dropped
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "128"))
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class AnswerCache:
+    """Answers given about one analysis, matched exactly or by question embedding similarity"""
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_entries: int = ANSWER_CACHE_SIZE
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # Normalized question -> (unit question vector or None, answer)
+        self._entries: "OrderedDict[str, Tuple[Optional[List[float]], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, question: str) -> Optional[str]:
+        """Get the answer to the same or a near-duplicate question, if one was cached"""
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            has_vectors = any(vector is not None for vector, _ in self._entries.values())
+
+        # Only embed when there is something to compare against
+        if self.embeddings is None or not has_vectors:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        vector = self._embed(key)
+        if vector is None:
+            # Embedding failed; exact matches were already checked
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            best_key, best_score = None, self.threshold
+            for cached_key, (cached_vector, _) in self._entries.items():
+                if cached_vector is None:
+                    continue
+                score = sum(a * b for a, b in zip(vector, cached_vector))
+                if score >= best_score:
+                    best_key, best_score = cached_key, score
+
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key][1]
+
+    def put(self, question: str, answer: str):
+        """Cache an answer, evicting the least recently used ones over the limit"""
+        key = normalize_question(question)
+        vector = self._embed(key) if self.embeddings is not None else None
+        with self._lock:
+            self._entries[key] = (vector, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        try:
+            return _unit(self.embeddings.embed_query(text))
+        except Exception:
+            # Similarity matching is best effort; exact matches still work
+            return None
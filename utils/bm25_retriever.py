@@ -0,0 +1,128 @@
+import re
+import math
+from collections import Counter
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its me my "
+    "of on or our should so that the their them they this to was we what when where "
+    "which who why will with you your".split()
+)
+
+# Readable names for the analysis keys that show up in chunk paths
+SECTION_NAMES = {
+    "team_analysis": "team analysis",
+    "player_analysis": "player analysis",
+    "matchup_insights": "matchup insights",
+    "meta_analysis": "meta analysis current patch",
+    "win_conditions": "win conditions",
+    "counter_strategy": "counter strategy",
+    "performance_metrics": "performance metrics",
+    "itemization": "itemization items build",
+    "adc": "adc bot lane",
+}
+
+
+def _stem(token: str) -> str:
+    # Light plural folding so "items" matches "item" and "tips" matches "tip"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, plural-folded word tokens without stopwords"""
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_analysis(analysis_data: Dict[str, Any]) -> List[Document]:
+    """
+    Split analysis results into one document per fact (each strength, each win
+    condition, each lane tip, ...), prefixed with the path it came from
+    """
+    documents = []
+
+    def walk(value, path):
+        if isinstance(value, dict):
+            for key, child in value.items():
+                walk(child, path + [key])
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, path)
+        elif value not in (None, ""):
+            label = " > ".join(SECTION_NAMES.get(part, str(part).replace("_", " ")) for part in path)
+            documents.append(Document(
+                page_content=f"{label}: {value}",
+                metadata={"section": path[0], "path": ".".join(str(part) for part in path)}
+            ))
+
+    for section, content in analysis_data.items():
+        walk(content, [section])
+    return documents
+
+
+class BM25Retriever(BaseRetriever):
+    """In-process Okapi BM25 keyword retriever over a small set of documents"""
+
+    documents: List[Document]
+    k: int = 6
+    k1: float = 1.5
+    b: float = 0.75
+    # Built by from_documents
+    term_frequencies: List[Dict[str, int]] = []
+    document_lengths: List[int] = []
+    idf: Dict[str, float] = {}
+    average_length: float = 0.0
+
+    @classmethod
+    def from_documents(cls, documents: List[Document], **kwargs) -> "BM25Retriever":
+        """Index the documents"""
+        term_frequencies = [Counter(tokenize(document.page_content)) for document in documents]
+        document_lengths = [sum(frequencies.values()) for frequencies in term_frequencies]
+
+        document_frequencies = Counter()
+        for frequencies in term_frequencies:
+            document_frequencies.update(frequencies.keys())
+        count = len(documents)
+        idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequencies.items()
+        }
+
+        return cls(
+            documents=documents,
+            term_frequencies=term_frequencies,
+            document_lengths=document_lengths,
+            idf=idf,
+            average_length=(sum(document_lengths) / count) if count else 0.0,
+            **kwargs
+        )
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every document for a query"""
+        terms = [term for term in tokenize(query) if term in self.idf]
+        scores = []
+        for frequencies, length in zip(self.term_frequencies, self.document_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.average_length or 1.0))
+            for term in terms:
+                frequency = frequencies.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        scores = self.scores(query)
+        ranked = sorted(range(len(scores)), key=lambda index: scores[index], reverse=True)
+        matches = [self.documents[index] for index in ranked[:self.k] if scores[index] > 0]
+        if matches:
+            return matches
+        # Nothing matched a keyword (e.g. "what should I do?"), fall back to the summaries
+        return [document for document in self.documents if document.metadata["path"].endswith("summary")][:self.k]
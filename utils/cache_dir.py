@@ -0,0 +1,13 @@
+import os
+from pathlib import Path
+
+# Default cache root lives next to the app so every worker process shares it
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parent.parent / ".cache"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """Get a directory under the local cache root, creating it if needed"""
+    root = Path(os.getenv("DRAFTMASTER_CACHE_DIR") or DEFAULT_CACHE_ROOT)
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,168 @@
+import os
+import time
+import struct
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.ddragon import DDRAGON_BASE_URL, RETRY_AFTER_FAILURE, DataDragonStore, get_static_data_store
+
+# Streamlit serves ./static at app/static when server.enableStaticServing is on
+STATIC_ROOT = Path(__file__).resolve().parent.parent / "static"
+STATIC_URL_PREFIX = "app/static"
+
+# Sprite sheets are downloaded in parallel the first time a patch is seen
+SPRITE_DOWNLOAD_WORKERS = 4
+
+
+def _png_size(path: Path) -> Tuple[int, int]:
+    """Read width and height from a PNG's IHDR chunk"""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+class ChampionIconService:
+    """Champion icons and sprite sheets cached locally once per patch"""
+
+    def __init__(self, store: Optional[DataDragonStore] = None, static_root: Path = STATIC_ROOT):
+        self.store = store or get_static_data_store()
+        self.static_root = static_root
+        self._sheet_sizes: Dict[tuple, Tuple[int, int]] = {}
+        # Downloads that failed, with the time before which they are not retried
+        self._retry_after: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def icon_url(self, champion_name: str, version: Optional[str] = None) -> str:
+        """Get a locally served icon URL, falling back to the Data Dragon CDN"""
+        index = self.store.champion_index(version)
+        asset_key = index.asset_key(champion_name)
+        remote_url = f"{DDRAGON_BASE_URL}/cdn/{index.version}/img/champion/{asset_key}.png"
+        path = self.static_root / "ddragon" / index.version / "champion" / f"{asset_key}.png"
+
+        if path.exists():
+            return self._static_url(path)
+        if self._recently_failed(remote_url):
+            return remote_url
+
+        try:
+            self._download(remote_url, path)
+            return self._static_url(path)
+        except (requests.exceptions.RequestException, OSError):
+            self._record_failure(remote_url)
+            return remote_url
+
+    def icon_html(
+        self,
+        champion_name: str,
+        size: int = 48,
+        css_class: str = "champion-icon",
+        style: str = "",
+        version: Optional[str] = None,
+    ) -> str:
+        """Render a champion icon as a sprite-sheet tile, or an <img> if no sprite is available"""
+        index = self.store.champion_index(version)
+        sprite = index.sprite(champion_name)
+        label = escape(champion_name)
+
+        sheet_sizes = self.ensure_sprite_sheets(index.version) if sprite else {}
+        if not sprite or sprite[0] not in sheet_sizes:
+            return (
+                f'<img src="{self.icon_url(champion_name, index.version)}" width="{size}" height="{size}" '
+                f'class="{css_class}" style="{style}" alt="{label}">'
+            )
+
+        sheet, x, y, w, h = sprite
+        sheet_width, sheet_height = sheet_sizes[sheet]
+        scale = size / w
+        sheet_url = self._static_url(self._sheet_path(index.version, sheet))
+        return (
+            f'<div class="champion-sprite {css_class}" role="img" aria-label="{label}" title="{label}" '
+            f'style="width: {size}px; height: {size}px; '
+            f"background-image: url('{sheet_url}'); "
+            f"background-size: {sheet_width * scale:g}px {sheet_height * scale:g}px; "
+            f'background-position: -{x * scale:g}px -{y * scale:g}px; {style}"></div>'
+        )
+
+    def ensure_sprite_sheets(self, version: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+        """Download every champion sprite sheet for a patch and return their pixel sizes"""
+        index = self.store.champion_index(version)
+        sheets = sorted({sprite[0] for sprite in index.key_to_sprite.values()})
+
+        missing = [sheet for sheet in sheets if self._needs_download(index.version, sheet)]
+        if missing:
+            with self._lock:
+                missing = [sheet for sheet in missing if self._needs_download(index.version, sheet)]
+                with ThreadPoolExecutor(max_workers=SPRITE_DOWNLOAD_WORKERS) as pool:
+                    results = pool.map(lambda sheet: self._load_sprite_sheet(index.version, sheet), missing)
+                    for sheet, size in zip(missing, results):
+                        if size:
+                            self._sheet_sizes[(index.version, sheet)] = size
+
+        return {
+            sheet: self._sheet_sizes[(index.version, sheet)]
+            for sheet in sheets
+            if (index.version, sheet) in self._sheet_sizes
+        }
+
+    def _needs_download(self, version: str, sheet: str) -> bool:
+        if (version, sheet) in self._sheet_sizes:
+            return False
+        return not self._recently_failed(self._sheet_url(version, sheet))
+
+    def _load_sprite_sheet(self, version: str, sheet: str) -> Optional[Tuple[int, int]]:
+        path = self._sheet_path(version, sheet)
+        url = self._sheet_url(version, sheet)
+        try:
+            self._download(url, path)
+            return _png_size(path)
+        except (requests.exceptions.RequestException, OSError, struct.error):
+            # Render <img> fallbacks instead of retrying on every page view while the CDN is down
+            self._record_failure(url)
+            return None
+
+    def _recently_failed(self, url: str) -> bool:
+        return time.monotonic() < self._retry_after.get(url, 0.0)
+
+    def _record_failure(self, url: str):
+        self._retry_after[url] = time.monotonic() + RETRY_AFTER_FAILURE
+
+    def _sheet_url(self, version: str, sheet: str) -> str:
+        return f"{DDRAGON_BASE_URL}/cdn/{version}/img/sprite/{sheet}"
+
+    def _sheet_path(self, version: str, sheet: str) -> Path:
+        return self.static_root / "ddragon" / version / "sprite" / sheet
+
+    def _static_url(self, path: Path) -> str:
+        return f"{STATIC_URL_PREFIX}/{path.relative_to(self.static_root).as_posix()}"
+
+    def _download(self, url: str, path: Path):
+        if path.exists():
+            return
+
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+
+        # Write to a temp file first so the static server never serves a partial image
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(temp_path, path)
+
+
+_service: Optional[ChampionIconService] = None
+_service_lock = threading.Lock()
+
+
+def get_champion_icon_service() -> ChampionIconService:
+    """Get the process-wide champion icon service"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ChampionIconService()
+    return _service
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+ROLES = ("Top", "Jungle", "Mid", "ADC", "Support")
+
+# One bit per role so a champion's roles fit in a single int
+ROLE_BITS = {role: 1 << i for i, role in enumerate(ROLES)}
+
+# Map Data Dragon tags to roles
+TAG_ROLES = {
+    "Fighter": ("Top", "Jungle"),
+    "Tank": ("Top", "Support", "Jungle"),
+    "Mage": ("Mid", "Support"),
+    "Assassin": ("Mid", "Jungle"),
+    "Marksman": ("ADC",),
+    "Support": ("Support",),
+}
+
+
+def sanitize_champion_name(champion_name: str) -> str:
+    """Strip the characters Data Dragon leaves out of asset file names"""
+    return champion_name.replace("'", "").replace(" ", "").replace(".", "")
+
+
+@dataclass(frozen=True)
+class ChampionIndex:
+    """Immutable champion lookups for one patch"""
+
+    version: str
+    names: Tuple[str, ...]
+    id_to_name: Mapping[int, str]
+    name_to_key: Mapping[str, str]
+    name_to_roles: Mapping[str, int]
+    role_to_names: Mapping[str, Tuple[str, ...]]
+    key_to_sprite: Mapping[str, Tuple[str, int, int, int, int]]
+
+    @classmethod
+    def from_champion_data(cls, version: str, champions_data: Dict[str, Any]) -> "ChampionIndex":
+        """Build the index from champion.json data keyed by champion name"""
+        id_to_name = {}
+        name_to_key = {}
+        name_to_roles = {}
+        key_to_sprite = {}
+
+        for champ_name, champ_data in champions_data.items():
+            id_to_name[int(champ_data["key"])] = champ_name
+
+            # Asset key comes from the image file, e.g. "MonkeyKing.png"
+            image = champ_data.get("image", {})
+            asset_key = image.get("full", f"{champ_name}.png")[:-4]
+            name_to_key[champ_name] = asset_key
+            # Also resolve display names ("Wukong", "Kai'Sa") and loose spellings
+            name_to_key.setdefault(champ_data.get("name", champ_name), asset_key)
+            name_to_key.setdefault(sanitize_champion_name(champ_data.get("name", champ_name)).lower(), asset_key)
+            name_to_key.setdefault(champ_name.lower(), asset_key)
+
+            # Sprite sheet file and tile offsets, e.g. ("champion0.png", 48, 0, 48, 48)
+            if "sprite" in image:
+                key_to_sprite[asset_key] = (image["sprite"], image["x"], image["y"], image["w"], image["h"])
+
+            mask = 0
+            for tag in champ_data.get("tags", []):
+                for role in TAG_ROLES.get(tag, ()):
+                    mask |= ROLE_BITS[role]
+            name_to_roles[champ_name] = mask
+
+        names = tuple(sorted(champions_data.keys()))
+        role_to_names = {
+            role: tuple(name for name in names if name_to_roles[name] & ROLE_BITS[role])
+            for role in ROLES
+        }
+
+        return cls(
+            version=version,
+            names=names,
+            id_to_name=MappingProxyType(id_to_name),
+            name_to_key=MappingProxyType(name_to_key),
+            name_to_roles=MappingProxyType(name_to_roles),
+            role_to_names=MappingProxyType(role_to_names),
+            key_to_sprite=MappingProxyType(key_to_sprite),
+        )
+
+    def name_for_id(self, champion_id: int) -> Optional[str]:
+        """Get the champion name for a numeric champion ID"""
+        return self.id_to_name.get(int(champion_id))
+
+    def asset_key(self, champion_name: str) -> str:
+        """Get the Data Dragon asset key for a champion name"""
+        asset_key = self.name_to_key.get(champion_name)
+        if asset_key is None:
+            sanitized_name = sanitize_champion_name(champion_name)
+            asset_key = self.name_to_key.get(sanitized_name.lower(), sanitized_name)
+        return asset_key
+
+    def role_mask(self, champion_name: str) -> int:
+        """Get the role bitmask for a champion (0 if unknown)"""
+        return self.name_to_roles.get(champion_name, 0)
+
+    def sprite(self, champion_name: str) -> Optional[Tuple[str, int, int, int, int]]:
+        """Get the (sheet, x, y, w, h) sprite tile for a champion"""
+        return self.key_to_sprite.get(self.asset_key(champion_name))
+
+    def champions_for_role(self, role: str) -> Tuple[str, ...]:
+        """Get the sorted champion names that can play a role"""
+        return self.role_to_names.get(role, ())
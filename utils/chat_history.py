@@ -0,0 +1,68 @@
+import os
+from typing import List, Tuple
+
+# Recent turns handed to the chain verbatim; older ones are folded into the summary
+CHAT_HISTORY_TURNS = int(os.getenv("CHAT_HISTORY_TURNS", "6"))
+
+# Extra turns allowed to pile up before folding, so the summary is not rewritten every turn
+CHAT_SUMMARY_BATCH = int(os.getenv("CHAT_SUMMARY_BATCH", "4"))
+
+SUMMARY_PROMPT = """
+Progressively summarize a conversation between a League of Legends player and an analyst about
+a pre-game analysis. Extend the current summary with the new lines and return only the new summary,
+at most 150 words. Keep champion names, lanes, items and any decisions or preferences the player stated.
+
+Current summary:
+{summary}
+
+New lines:
+{lines}
+
+New summary:
+"""
+
+Turn = Tuple[str, str]
+
+
+def history_for_chain(turns: List[Turn], summary: str) -> List[Turn]:
+    """
+    Chat history to hand to the chain: the summary as a leading turn, then the
+    last CHAT_HISTORY_TURNS turns
+
+    The chat itself renders every turn not yet folded into the summary.
+    """
+    recent = list(turns[-CHAT_HISTORY_TURNS:])
+    if not summary:
+        return recent
+    return [("Summarize our conversation so far.", summary)] + recent
+
+
+def needs_folding(turns: List[Turn]) -> bool:
+    return len(turns) >= CHAT_HISTORY_TURNS + CHAT_SUMMARY_BATCH
+
+
+def summarize_turns(summary: str, turns: List[Turn], api_key: str) -> str:
+    """Fold turns into the rolling summary with one LLM call"""
+    from langchain_community.chat_models import ChatOpenAI
+
+    lines = "\n".join(f"Player: {question}\nAnalyst: {answer}" for question, answer in turns)
+    model = ChatOpenAI(temperature=0.0, openai_api_key=api_key)
+    return model.invoke(SUMMARY_PROMPT.format(summary=summary or "(empty)", lines=lines)).content.strip()
+
+
+def fold_history(turns: List[Turn], summary: str, api_key: str) -> Tuple[List[Turn], str]:
+    """
+    Keep the last CHAT_HISTORY_TURNS turns and fold older ones into the summary
+
+    Returns:
+        tuple: (recent turns, updated summary); unchanged when below the limit
+    """
+    if not needs_folding(turns):
+        return turns, summary
+
+    older, recent = turns[:-CHAT_HISTORY_TURNS], turns[-CHAT_HISTORY_TURNS:]
+    try:
+        return recent, summarize_turns(summary, older, api_key)
+    except Exception:
+        # Keep the turns and retry on the next turn rather than losing them
+        return turns, summary
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import threading
+import requests
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.cache_dir import get_cache_dir
+from utils.champion_index import ChampionIndex
+
+# Overridable so the app can point at a local stand-in (see benchmarks/riot_standin.py)
+DDRAGON_BASE_URL = os.getenv("DDRAGON_BASE_URL", "https://ddragon.leagueoflegends.com").rstrip("/")
+
+# Static data files fetched once per patch
+STATIC_DATA_FILES = ("champion", "item", "summoner")
+
+# Seconds the latest version is trusted before asking Data Dragon again
+DEFAULT_VERSION_TTL = float(os.getenv("DDRAGON_VERSION_TTL", "3600"))
+
+# Seconds to keep serving a stale version after a failed refresh
+RETRY_AFTER_FAILURE = 60.0
+
+
+class PatchVersionResolver:
+    """Latest patch version with a TTL and single-flight refresh"""
+
+    def __init__(self, ttl: float = DEFAULT_VERSION_TTL):
+        self.ttl = ttl
+        self._version: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """Get the latest patch version, refreshing it once the TTL expires"""
+        if self._version is not None and time.monotonic() < self._expires_at:
+            return self._version
+
+        # Only one thread refreshes; the others wait and reuse its result
+        with self._lock:
+            if self._version is not None and time.monotonic() < self._expires_at:
+                return self._version
+
+            try:
+                response = requests.get(f"{DDRAGON_BASE_URL}/api/versions.json", timeout=10)
+                response.raise_for_status()
+                self._version = response.json()[0]
+                self._expires_at = time.monotonic() + self.ttl
+            except requests.exceptions.RequestException:
+                if self._version is None:
+                    raise
+                # Keep serving the last known version and retry a bit later
+                self._expires_at = time.monotonic() + min(self.ttl, RETRY_AFTER_FAILURE)
+
+            return self._version
+
+    def invalidate(self):
+        """Force the next lookup to ask Data Dragon again"""
+        with self._lock:
+            self._expires_at = 0.0
+
+
+class DataDragonStore:
+    """Data Dragon static data keyed by patch version and persisted on local disk"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, locale: str = "en_US"):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir("ddragon")
+        self.locale = locale
+        self._data: Dict[tuple, Dict[str, Any]] = {}
+        self._indexes: Dict[str, ChampionIndex] = {}
+        self._lock = threading.Lock()
+
+    def latest_version(self) -> str:
+        """Get the latest patch version from the shared resolver"""
+        return get_latest_version()
+
+    def get(self, name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """Get a static data file (champion, item, summoner) for a patch"""
+        version = version or self.latest_version()
+        key = (version, name)
+
+        # Fast path: already loaded in this process
+        data = self._data.get(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                data = self._read_from_disk(version, name)
+                if data is None:
+                    data = self._download(version, name)
+                    self._write_to_disk(version, name, data)
+                self._data[key] = data
+        return data
+
+    def champions(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """Get champion data keyed by champion name"""
+        return self.get("champion", version)["data"]
+
+    def champion_index(self, version: Optional[str] = None) -> ChampionIndex:
+        """Get the champion index for a patch, built once per version"""
+        version = version or self.latest_version()
+        index = self._indexes.get(version)
+        if index is None:
+            index = ChampionIndex.from_champion_data(version, self.champions(version))
+            self._indexes[version] = index
+        return index
+
+    def items(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """Get item data keyed by item ID"""
+        return self.get("item", version)["data"]
+
+    def summoner_spells(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """Get summoner spell data keyed by spell name"""
+        return self.get("summoner", version)["data"]
+
+    def _path(self, version: str, name: str) -> Path:
+        return self.cache_dir / version / self.locale / f"{name}.json"
+
+    def _read_from_disk(self, version: str, name: str) -> Optional[Dict[str, Any]]:
+        path = self._path(version, name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Missing or partially written file, download it again
+            return None
+
+    def _write_to_disk(self, version: str, name: str, data: Dict[str, Any]):
+        path = self._path(version, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file first so other processes never read a partial file
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    def _download(self, version: str, name: str) -> Dict[str, Any]:
+        url = f"{DDRAGON_BASE_URL}/cdn/{version}/data/{self.locale}/{name}.json"
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+
+_resolver = PatchVersionResolver()
+_store: Optional[DataDragonStore] = None
+_store_lock = threading.Lock()
+
+
+def get_static_data_store() -> DataDragonStore:
+    """Get the process-wide Data Dragon store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DataDragonStore()
+    return _store
+
+
+def get_latest_version() -> str:
+    """Get the latest patch version from the process-wide resolver"""
+    return _resolver.get()
+
+
+def invalidate_latest_version():
+    """Invalidate the process-wide patch version so the next lookup refetches it"""
+    _resolver.invalidate()
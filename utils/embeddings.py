@@ -0,0 +1,194 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import importlib.util
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_community.embeddings import OpenAIEmbeddings
+
+from utils.cache_dir import get_cache_dir
+
+# "local" (sentence-transformers on CPU), "openai", or "auto" (local when installed)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "auto")
+
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = 64
+
+# Vectors kept on disk (across all backends) before the least recently used ones are evicted
+MAX_CACHED_VECTORS = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    namespace TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    accessed_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, text_hash)
+);
+"""
+
+INDEX = "CREATE INDEX IF NOT EXISTS idx_vectors_accessed ON vectors (accessed_at)"
+
+
+class LocalEmbeddings(Embeddings):
+    """Sentence-transformers model run on CPU in batches (optional dependency)"""
+
+    _models: Dict[str, object] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_name: str = LOCAL_EMBEDDING_MODEL, batch_size: int = EMBEDDING_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+    def _model(self):
+        # Loading the model takes seconds, so it happens once per process
+        model = self._models.get(self.model_name)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(self.model_name)
+                if model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise ImportError(
+                            "The local embedding backend needs sentence-transformers: "
+                            "pip install sentence-transformers"
+                        ) from e
+                    model = self._models[self.model_name] = SentenceTransformer(self.model_name, device="cpu")
+        return model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an embedding backend with a disk cache keyed by text hash"""
+
+    def __init__(
+        self,
+        backend: Embeddings,
+        namespace: str,
+        path: Optional[Path] = None,
+        max_entries: int = MAX_CACHED_VECTORS
+    ):
+        self.backend = backend
+        self.max_entries = max_entries
+        # Vectors from different models are not interchangeable
+        self.namespace = namespace
+        self.path = Path(path) if path else get_cache_dir("embeddings") / "vectors.sqlite3"
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Caches created before LRU eviction lack the access time column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(vectors)")}
+            if "accessed_at" not in columns:
+                with conn:
+                    conn.execute("ALTER TABLE vectors ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            conn.execute(INDEX)
+            self._local.conn = conn
+        return conn
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors = self._load(set(hashes))
+
+        # Embed only texts not seen before, in one batch
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in vectors:
+                missing.setdefault(text_hash, text)
+        if missing:
+            embedded = self.backend.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), embedded))
+            self._store(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # Questions repeat too, so queries share the cache
+        return self.embed_documents([text])[0]
+
+    def _load(self, hashes: set) -> Dict[str, List[float]]:
+        if not hashes:
+            return {}
+        hashes = list(hashes)
+        placeholders = ",".join("?" * len(hashes))
+        conn = self._connection()
+        with conn:
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM vectors WHERE namespace = ? AND text_hash IN ({placeholders})",
+                [self.namespace] + hashes
+            ).fetchall()
+            if rows:
+                conn.execute(
+                    f"UPDATE vectors SET accessed_at = ? WHERE namespace = ? AND text_hash IN ({placeholders})",
+                    [time.time(), self.namespace] + hashes
+                )
+        return {text_hash: array("f", blob).tolist() for text_hash, blob in rows}
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        """Store new vectors and evict the least recently used ones over the limit"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO vectors (namespace, text_hash, vector, accessed_at) VALUES (?, ?, ?, ?)",
+                [
+                    (self.namespace, text_hash, array("f", vector).tobytes(), now)
+                    for text_hash, vector in vectors.items()
+                ]
+            )
+            conn.execute(
+                """
+                DELETE FROM vectors WHERE rowid NOT IN (
+                    SELECT rowid FROM vectors ORDER BY accessed_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+
+def resolve_embedding_backend(backend: str = EMBEDDING_BACKEND) -> str:
+    """Resolve "auto" to the local backend when sentence-transformers is installed, else to openai"""
+    if backend == "auto":
+        return "local" if importlib.util.find_spec("sentence_transformers") else "openai"
+    return backend
+
+
+def get_embeddings(api_key: Optional[str] = None, backend: str = EMBEDDING_BACKEND) -> Embeddings:
+    """
+    Get the configured embedding backend wrapped in the disk cache
+
+    Args:
+        api_key: OpenAI API key (only used by the openai backend)
+        backend: "local", "openai" or "auto"
+    """
+    backend = resolve_embedding_backend(backend)
+    if backend == "local":
+        return CachedEmbeddings(LocalEmbeddings(), f"local:{LOCAL_EMBEDDING_MODEL}")
+    if backend == "openai":
+        embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+        return CachedEmbeddings(embeddings, f"openai:{embeddings.model}")
+    raise ValueError(f"Unknown embedding backend: {backend}")
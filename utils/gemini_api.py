@@ -1,103 +1,385 @@
-import google.generativeai as genai
+import os
+import re
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 import streamlit as st
 import json
-import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
+
+from utils.cache_dir import get_cache_dir
+from utils.ddragon import get_latest_version
+
+# Seconds a patch analysis is served before it is regenerated in the background
+PATCH_ANALYSIS_TTL = float(os.getenv("PATCH_ANALYSIS_TTL", str(6 * 3600)))
+
+# Seconds a patch's video feed is reused before YouTube is searched again
+VIDEO_FEED_TTL = float(os.getenv("VIDEO_FEED_TTL", "3600"))
+
+# Seconds before retrying YouTube after a failed search
+VIDEO_FEED_RETRY = 60.0
+
+# Translated video descriptions kept in memory, keyed by the hash of the original text
+MAX_TRANSLATIONS = 1024
+
+# English function words only: gaming loanwords ("guide", "patch", "best") show up in every language
+ENGLISH_HINTS = frozenset(
+    "the and to of is for with how what your you are this that it why when".split()
+)
+
+# Share of a text's words that must be English function words for it to skip translation
+ENGLISH_HINT_RATIO = 0.15
+
+
+class PatchAnalysisCache:
+    """
+    Gemini patch analyses keyed by patch version, shared by all sessions and persisted on disk
+
+    Cached analyses are always returned immediately; once older than the TTL a
+    single background thread regenerates them. Only a version that has never
+    been analyzed makes the caller wait (once, for all concurrent callers).
+    """
+
+    def __init__(self, ttl: float = PATCH_ANALYSIS_TTL):
+        self.ttl = ttl
+        self.cache_dir = get_cache_dir("gemini")
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._version_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, version: str, generate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the analysis for a patch version
+
+        Args:
+            version: Patch version
+            generate: Produces a fresh analysis; must not call Streamlit since it
+                may run in a background thread, and should raise on failure
+        """
+        entry = self._entries.get(version) or self._load(version)
+        if entry is not None:
+            analysis, generated_at = entry
+            if time.time() - generated_at >= self.ttl:
+                self._refresh_in_background(version, generate)
+            return analysis
+
+        # Nothing cached for this patch yet: one caller generates, the others wait for it
+        with self._version_lock(version):
+            entry = self._entries.get(version)
+            if entry is not None:
+                return entry[0]
+            return self._store(version, generate())
+
+    async def get_async(
+        self,
+        version: str,
+        generate_async: Callable[[], Awaitable[Dict[str, Any]]],
+        generate: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Async variant of get: a missing analysis is generated with generate_async
+        under the same per-version lock, so sync and async callers still share
+        one generation; stale ones are refreshed in the background with generate
+        """
+        entry = self._entries.get(version) or self._load(version)
+        if entry is not None:
+            analysis, generated_at = entry
+            if time.time() - generated_at >= self.ttl:
+                self._refresh_in_background(version, generate)
+            return analysis
+
+        # Poll instead of blocking in a thread, so a cancelled task never ends up holding the lock
+        lock = self._version_lock(version)
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            entry = self._entries.get(version)
+            if entry is not None:
+                return entry[0]
+            return self._store(version, await generate_async())
+        finally:
+            lock.release()
+
+    def _version_lock(self, version: str) -> threading.Lock:
+        with self._lock:
+            return self._version_locks.setdefault(version, threading.Lock())
+
+    def _refresh_in_background(self, version: str, generate: Callable[[], Dict[str, Any]]):
+        with self._lock:
+            if version in self._refreshing:
+                return
+            self._refreshing.add(version)
+
+        def refresh():
+            try:
+                self._store(version, generate())
+            except Exception:
+                # Keep serving the stale analysis; the next reader retries after the TTL
+                with self._lock:
+                    analysis, _ = self._entries[version]
+                    self._entries[version] = (analysis, time.time() - self.ttl + min(self.ttl, 300))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(version)
+
+        threading.Thread(target=refresh, name=f"patch-analysis-{version}", daemon=True).start()
+
+    def _path(self, version: str):
+        return self.cache_dir / f"patch_analysis_{version}.json"
+
+    def _load(self, version: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        try:
+            with open(self._path(version), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry = (cached["analysis"], cached["generated_at"])
+        self._entries[version] = entry
+        return entry
+
+    def _store(self, version: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        generated_at = time.time()
+        self._entries[version] = (analysis, generated_at)
+
+        # Write to a temp file first so other processes never read a partial file
+        path = self._path(version)
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"analysis": analysis, "generated_at": generated_at}, f)
+        os.replace(temp_path, path)
+        return analysis
+
+
+_patch_analysis_cache = PatchAnalysisCache()
+
+
+def get_patch_analysis_cache() -> PatchAnalysisCache:
+    """Get the process-wide patch analysis cache"""
+    return _patch_analysis_cache
+
+
+def looks_english(text: str) -> bool:
+    """Cheap check that a text is already English: Latin letters only and enough English function words"""
+    letters = [char for char in text if char.isalpha()]
+    if not letters:
+        return True
+    if sum(char.isascii() for char in letters) / len(letters) < 0.95:
+        return False
+    words = re.findall(r"[a-z']+", text.lower())
+    if len(words) < 3:
+        return True
+    return sum(word in ENGLISH_HINTS for word in words) / len(words) >= ENGLISH_HINT_RATIO
+
+
+_translations: "OrderedDict[str, str]" = OrderedDict()
+_translations_lock = threading.Lock()
+
+
+def translate_to_english(texts: List[str], gemini_api_key: str) -> List[str]:
+    """
+    Translate texts to English with one batched Gemini request
+
+    Texts that already look English or were translated before are not sent.
+    Returns the originals for anything that could not be translated; never
+    calls Streamlit.
+    """
+    keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+    results = list(texts)
+    pending: Dict[str, str] = {}
+    
+    with _translations_lock:
+        for index, (text, key) in enumerate(zip(texts, keys)):
+            if key in _translations:
+                _translations.move_to_end(key)
+                results[index] = _translations[key]
+            elif not looks_english(text):
+                pending[key] = text
+    
+    if not pending or not gemini_api_key:
+        return results
+    
+    try:
+        model = GeminiMetaAnalyzer(gemini_api_key).model
+        prompt = (
+            "Translate each text in this JSON array to English. Respond with only a JSON array of "
+            "strings containing the translations in the same order, no commentary:\n\n"
+            + json.dumps(list(pending.values()), ensure_ascii=False)
+        )
+        translated = GeminiMetaAnalyzer._load_json(model.generate_content(prompt).text)
+    except Exception:
+        return results
+    
+    if not isinstance(translated, list) or len(translated) != len(pending):
+        return results
+    
+    with _translations_lock:
+        for key, translation in zip(pending.keys(), translated):
+            _translations[key] = str(translation).strip()
+        while len(_translations) > MAX_TRANSLATIONS:
+            _translations.popitem(last=False)
+        for index, key in enumerate(keys):
+            if key in pending:
+                results[index] = _translations[key]
+    
+    return results
+
 
 class GeminiMetaAnalyzer:
     def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
+        # Imported on first use so pages without Gemini do not pay for loading it
+        import google.generativeai as genai
+        from google.generativeai.client import _ClientManager
+        
+        # genai.configure() sets one process-wide key, but analyzers run concurrently for
+        # different sessions and the warmup job, so each one gets clients bound to its own key
+        self._clients = _ClientManager()
+        self._clients.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model._client = self._clients.make_client("generative")
+    
+    def _async_model(self):
+        """The model with an async client bound to this analyzer's key (created inside the running loop)"""
+        if self.model._async_client is None:
+            self.model._async_client = self._clients.make_client("generative_async")
+        return self.model
     
     def get_latest_patch_analysis(self) -> Dict[str, Any]:
-        """Get AI-powered analysis of the latest LoL patch"""
+        """Get AI-powered analysis of the latest LoL patch (cached per patch for all sessions)"""
         try:
             # Get current patch data
             patch_data = self._fetch_current_patch_data()
             
-            # Create analysis prompt
-            prompt = f"""
-            Analyze the latest League of Legends patch data and provide insights:
-            
-            Current Patch: {patch_data.get('version', 'Unknown')}
-            Release Date: {patch_data.get('date', 'Unknown')}
-            
-            Based on general League of Legends knowledge and typical patch patterns, provide analysis on:
-            1. Key meta shifts and champion tier changes
-            2. Most impactful champion buffs/nerfs
-            3. Item changes affecting gameplay
-            4. Predicted trending picks for each role
-            5. Strategic recommendations for players
-            
-            Format your response as JSON with this exact structure:
-            {{
-                "version": "patch version",
-                "summary": "brief 2-3 sentence overview of patch impact",
-                "champion_changes": ["change1", "change2", "change3"],
-                "item_changes": ["item change1", "item change2"],
-                "meta_predictions": ["prediction1", "prediction2", "prediction3"],
-                "trending_picks": {{
-                    "Top": ["champ1", "champ2"],
-                    "Jungle": ["champ1", "champ2"],
-                    "Mid": ["champ1", "champ2"],
-                    "ADC": ["champ1", "champ2"],
-                    "Support": ["champ1", "champ2"]
-                }},
-                "player_tips": ["tip1", "tip2", "tip3"]
-            }}
-            """
-            
-            response = self.model.generate_content(prompt)
-            return self._parse_json_response(response.text)
+            return get_patch_analysis_cache().get(
+                patch_data["version"],
+                lambda: self._generate_patch_analysis(patch_data)
+            )
             
         except Exception as e:
             st.error(f"Error getting patch analysis: {str(e)}")
             return self._get_fallback_analysis()
     
+    async def get_latest_patch_analysis_async(self) -> Dict[str, Any]:
+        """
+        Async variant of get_latest_patch_analysis for use off the script thread
+        
+        Shares the patch analysis cache; raises instead of reporting to Streamlit.
+        """
+        patch_data = await asyncio.to_thread(self._fetch_current_patch_data)
+        
+        return await get_patch_analysis_cache().get_async(
+            patch_data["version"],
+            lambda: self._generate_patch_analysis_async(patch_data),
+            lambda: self._generate_patch_analysis(patch_data)
+        )
+    
+    def _generate_patch_analysis(self, patch_data: Dict[str, str]) -> Dict[str, Any]:
+        """Ask Gemini for a patch analysis; raises on failure and never touches Streamlit"""
+        response = self.model.generate_content(self._patch_analysis_prompt(patch_data))
+        return self._load_json(response.text)
+    
+    async def _generate_patch_analysis_async(self, patch_data: Dict[str, str]) -> Dict[str, Any]:
+        """Async variant of _generate_patch_analysis"""
+        response = await self._async_model().generate_content_async(self._patch_analysis_prompt(patch_data))
+        return self._load_json(response.text)
+    
+    @staticmethod
+    def _patch_analysis_prompt(patch_data: Dict[str, str]) -> str:
+        # Create analysis prompt
+        return f"""
+        Analyze the latest League of Legends patch data and provide insights:
+        
+        Current Patch: {patch_data.get('version', 'Unknown')}
+        Release Date: {patch_data.get('date', 'Unknown')}
+        
+        Based on general League of Legends knowledge and typical patch patterns, provide analysis on:
+        1. Key meta shifts and champion tier changes
+        2. Most impactful champion buffs/nerfs
+        3. Item changes affecting gameplay
+        4. Predicted trending picks for each role
+        5. Strategic recommendations for players
+        
+        Format your response as JSON with this exact structure:
+        {{
+            "version": "patch version",
+            "summary": "brief 2-3 sentence overview of patch impact",
+            "champion_changes": ["change1", "change2", "change3"],
+            "item_changes": ["item change1", "item change2"],
+            "meta_predictions": ["prediction1", "prediction2", "prediction3"],
+            "trending_picks": {{
+                "Top": ["champ1", "champ2"],
+                "Jungle": ["champ1", "champ2"],
+                "Mid": ["champ1", "champ2"],
+                "ADC": ["champ1", "champ2"],
+                "Support": ["champ1", "champ2"]
+            }},
+            "player_tips": ["tip1", "tip2", "tip3"]
+        }}
+        """
+    
     def analyze_team_with_meta(self, team_comp: Dict[str, List[str]], current_meta: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze team composition considering current meta"""
         try:
-            prompt = f"""
-            Analyze this League of Legends team composition considering the current meta:
-            
-            Team Composition:
-            - Top: {team_comp.get('blue', [''])[0] or 'Not selected'}
-            - Jungle: {team_comp.get('blue', ['', ''])[1] or 'Not selected'}
-            - Mid: {team_comp.get('blue', ['', '', ''])[2] or 'Not selected'}
-            - ADC: {team_comp.get('blue', ['', '', '', ''])[3] or 'Not selected'}
-            - Support: {team_comp.get('blue', ['', '', '', '', ''])[4] or 'Not selected'}
-            
-            Current Meta Context:
-            Trending Picks: {current_meta.get('trending_picks', {})}
-            Meta Predictions: {current_meta.get('meta_predictions', [])}
-            
-            Provide analysis on how this team fits the current meta and suggestions for improvement.
-            
-            Format as JSON:
-            {{
-                "meta_alignment": "How well the team fits current meta (1-10)",
-                "meta_strengths": ["strength1", "strength2"],
-                "meta_weaknesses": ["weakness1", "weakness2"],
-                "meta_suggestions": ["suggestion1", "suggestion2"],
-                "tier_rating": "S/A/B/C/D tier in current meta"
-            }}
-            """
-            
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(self._team_meta_prompt(team_comp, current_meta))
             return self._parse_json_response(response.text)
             
         except Exception as e:
             st.error(f"Error analyzing team with meta: {str(e)}")
             return {}
     
+    async def analyze_team_with_meta_async(
+        self,
+        team_comp: Dict[str, List[str]],
+        current_meta: Dict[str, Any],
+        side: str = "blue"
+    ) -> Dict[str, Any]:
+        """
+        Async variant of analyze_team_with_meta that can run next to other analyses
+        
+        Analyzes the given side's team; raises on failure and never touches Streamlit.
+        """
+        model = self._async_model()
+        response = await model.generate_content_async(self._team_meta_prompt(team_comp, current_meta, side))
+        return self._load_json(response.text)
+    
+    @staticmethod
+    def _team_meta_prompt(team_comp: Dict[str, List[str]], current_meta: Dict[str, Any], side: str = "blue") -> str:
+        team = (list(team_comp.get(side, [])) + [""] * 5)[:5]
+        return f"""
+        Analyze this League of Legends team composition considering the current meta:
+        
+        Team Composition:
+        - Top: {team[0] or 'Not selected'}
+        - Jungle: {team[1] or 'Not selected'}
+        - Mid: {team[2] or 'Not selected'}
+        - ADC: {team[3] or 'Not selected'}
+        - Support: {team[4] or 'Not selected'}
+        
+        Current Meta Context:
+        Trending Picks: {current_meta.get('trending_picks', {})}
+        Meta Predictions: {current_meta.get('meta_predictions', [])}
+        
+        Provide analysis on how this team fits the current meta and suggestions for improvement.
+        
+        Format as JSON:
+        {{
+            "meta_alignment": "How well the team fits current meta (1-10)",
+            "meta_strengths": ["strength1", "strength2"],
+            "meta_weaknesses": ["weakness1", "weakness2"],
+            "meta_suggestions": ["suggestion1", "suggestion2"],
+            "tier_rating": "S/A/B/C/D tier in current meta"
+        }}
+        """
+    
     def _fetch_current_patch_data(self) -> Dict[str, str]:
         """Fetch current patch version and basic info"""
         try:
-            # Get latest version from Data Dragon
-            versions_response = requests.get("https://ddragon.leagueoflegends.com/api/versions.json")
-            versions_response.raise_for_status()
-            latest_version = versions_response.json()[0]
+            # Get latest version from the shared Data Dragon resolver
+            latest_version = get_latest_version()
             
             return {
                 "version": latest_version,
@@ -112,17 +394,22 @@ class GeminiMetaAnalyzer:
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """Parse JSON response from Gemini"""
         try:
-            # Clean the response text
-            cleaned_text = response_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-            
-            return json.loads(cleaned_text)
+            return self._load_json(response_text)
         except json.JSONDecodeError:
             return self._get_fallback_analysis()
     
+    @staticmethod
+    def _load_json(response_text: str) -> Dict[str, Any]:
+        """Strip Markdown code fences from a Gemini response and decode it"""
+        # Clean the response text
+        cleaned_text = response_text.strip()
+        if cleaned_text.startswith('```json'):
+            cleaned_text = cleaned_text[7:]
+        if cleaned_text.endswith('```'):
+            cleaned_text = cleaned_text[:-3]
+        
+        return json.loads(cleaned_text)
+    
     def _get_fallback_analysis(self) -> Dict[str, Any]:
         """Fallback analysis when API fails"""
         return {
@@ -157,8 +444,9 @@ class GeminiMetaAnalyzer:
         }
 
 class VideoContentFetcher:
-    def __init__(self, youtube_api_key: str = None):
+    def __init__(self, youtube_api_key: str = None, gemini_api_key: str = None):
         self.youtube_api_key = youtube_api_key
+        self.gemini_api_key = gemini_api_key
         self.fallback_videos = self._get_fallback_videos()
     
     def get_patch_videos(self, patch_version: str) -> List[Dict[str, str]]:
@@ -171,57 +459,49 @@ class VideoContentFetcher:
     def _fetch_youtube_videos(self, patch_version: str) -> List[Dict[str, str]]:
         """Fetch videos from YouTube API and translate descriptions to English using Gemini if available."""
         try:
-            from googleapiclient.discovery import build
-            import streamlit as st
-            
-            youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
-            search_query = f"League of Legends patch {patch_version} analysis guide"
-            request = youtube.search().list(
-                part="snippet",
-                q=search_query,
-                type="video",
-                order="relevance",
-                maxResults=6,
-                relevanceLanguage="en",
-                publishedAfter=(datetime.now() - timedelta(days=30)).isoformat() + 'Z'
-            )
-            response = request.execute()
-            
-            # Helper function for translation using Gemini
-            def translate_to_english(text, gemini_api_key):
-                try:
-                    import google.generativeai as genai
-                    genai.configure(api_key=gemini_api_key)
-                    model = genai.GenerativeModel('gemini-1.5-flash')
-                    prompt = f"Translate this text to English (output only the translation, no commentary):\n\n{text}"
-                    response = model.generate_content(prompt)
-                    return response.text.strip()
-                except Exception as e:
-                    st.warning(f"Translation failed: {str(e)}")
-                    return text
-            
-            gemini_api_key = st.session_state.get("GEMINI_API_KEY") if hasattr(st, 'session_state') else None
-            
-            videos = []
-            for item in response['items']:
-                desc = item['snippet']['description'][:100] + "..."
-                # Always translate if Gemini key is available
-                if gemini_api_key:
-                    desc = translate_to_english(desc, gemini_api_key)
-                videos.append({
-                    'title': item['snippet']['title'],
-                    'channel': item['snippet']['channelTitle'],
-                    'thumbnail': item['snippet']['thumbnails']['medium']['url'],
-                    'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    'description': desc
-                })
-            
-            return videos
-            
+            return self.fetch_videos(patch_version)
         except Exception as e:
             st.error(f"Error fetching YouTube videos: {str(e)}")
             return self.fallback_videos
     
+    def fetch_videos(self, patch_version: str) -> List[Dict[str, str]]:
+        """Search YouTube for patch videos; raises on failure and never touches Streamlit"""
+        from googleapiclient.discovery import build
+        
+        youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
+        search_query = f"League of Legends patch {patch_version} analysis guide"
+        request = youtube.search().list(
+            part="snippet",
+            q=search_query,
+            type="video",
+            order="relevance",
+            maxResults=6,
+            relevanceLanguage="en",
+            publishedAfter=(datetime.now() - timedelta(days=30)).isoformat() + 'Z'
+        )
+        response = request.execute()
+        
+        gemini_api_key = self.gemini_api_key
+        if gemini_api_key is None and hasattr(st, 'session_state'):
+            gemini_api_key = st.session_state.get("GEMINI_API_KEY")
+        
+        # Translate all non-English descriptions in one request when Gemini is available
+        descriptions = [item['snippet']['description'][:100] + "..." for item in response['items']]
+        if gemini_api_key:
+            descriptions = translate_to_english(descriptions, gemini_api_key)
+        
+        videos = []
+        for item, desc in zip(response['items'], descriptions):
+            videos.append({
+                'title': item['snippet']['title'],
+                'channel': item['snippet']['channelTitle'],
+                'thumbnail': item['snippet']['thumbnails']['medium']['url'],
+                'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+                'description': desc
+            })
+        
+        return videos
+    
     def _get_fallback_videos(self) -> List[Dict[str, str]]:
         """Fallback videos when API is not available"""
         return [
@@ -267,4 +547,135 @@ class VideoContentFetcher:
                 'url': 'https://youtube.com',
                 'description': 'Support champion recommendations for the current patch...'
             }
-        ]
\ No newline at end of file
+        ]
+
+
+@dataclass(frozen=True)
+class VideoFeed:
+    """Patch videos fetched once and shared by every section of the welcome page"""
+    patch_version: str
+    videos: Tuple[Dict[str, str], ...]
+    fetched_at: float
+    live: bool = True
+    error: Optional[str] = None
+    
+    @property
+    def top_video(self) -> Optional[Dict[str, str]]:
+        """Video shown in the autoplay embed"""
+        return self.videos[0] if self.videos else None
+    
+    @property
+    def grid(self) -> List[Dict[str, str]]:
+        """Videos shown as featured cards"""
+        return list(self.videos[:3])
+    
+    @property
+    def more(self) -> List[Dict[str, str]]:
+        """Videos shown in the "View More Videos" expander"""
+        return list(self.videos[3:6])
+
+
+class VideoFeedCache:
+    """Video feeds keyed by patch version, shared by all sessions, with a TTL and single-flight refresh"""
+    
+    def __init__(self, ttl: float = VIDEO_FEED_TTL):
+        self.ttl = ttl
+        self._feeds: Dict[str, Tuple[VideoFeed, float]] = {}
+        # When a page last read each feed (refreshes by the warmup job do not count)
+        self._read_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._version_locks: Dict[str, threading.Lock] = {}
+    
+    def due_for_refresh(self, patch_version: str, within: float) -> bool:
+        """
+        Whether a background refresh is worth a YouTube search: the feed is not
+        cached yet, or a page has read it since it was fetched and it expires
+        within the given number of seconds
+        """
+        cached = self._feeds.get(patch_version)
+        if cached is None:
+            return True
+        feed, expires_at = cached
+        if self._read_at.get(patch_version, 0.0) < feed.fetched_at:
+            return False
+        return expires_at - time.time() <= within
+    
+    def get(
+        self,
+        patch_version: str,
+        fetch: Callable[[], List[Dict[str, str]]],
+        fallback: List[Dict[str, str]],
+        refresh: bool = False
+    ) -> VideoFeed:
+        """
+        Get the feed for a patch, searching YouTube at most once per TTL window
+        
+        Args:
+            patch_version: Patch version
+            fetch: Searches YouTube; must not call Streamlit and should raise on failure
+            fallback: Videos to serve (briefly) when the search fails
+            refresh: Search again even if the cached feed has not expired yet
+        """
+        if not refresh:
+            self._read_at[patch_version] = time.time()
+        
+        cached = self._feeds.get(patch_version)
+        if not refresh and cached is not None and time.time() < cached[1]:
+            return cached[0]
+        
+        # One caller searches, the others wait for its result
+        with self._version_lock(patch_version):
+            cached = self._feeds.get(patch_version)
+            if not refresh and cached is not None and time.time() < cached[1]:
+                return cached[0]
+            
+            now = time.time()
+            try:
+                feed = VideoFeed(patch_version, tuple(fetch()), now)
+                expires_at = now + self.ttl
+            except Exception as e:
+                # Keep serving the last good feed if there is one, and retry soon
+                if cached is not None and cached[0].live:
+                    feed = cached[0]
+                else:
+                    feed = VideoFeed(patch_version, tuple(fallback), now, live=False, error=str(e))
+                expires_at = now + min(self.ttl, VIDEO_FEED_RETRY)
+            
+            self._feeds[patch_version] = (feed, expires_at)
+            return feed
+    
+    def _version_lock(self, patch_version: str) -> threading.Lock:
+        with self._lock:
+            return self._version_locks.setdefault(patch_version, threading.Lock())
+
+
+_video_feeds = VideoFeedCache()
+
+
+def get_video_feed(
+    patch_version: str,
+    youtube_api_key: str = None,
+    gemini_api_key: str = None,
+    refresh: bool = False
+) -> VideoFeed:
+    """
+    Get the shared video feed for a patch
+    
+    Without a YouTube API key the fallback videos are returned and nothing is fetched.
+    With refresh the feed is searched again even if it has not expired (used by the warmup job).
+    """
+    # An explicit (possibly empty) Gemini key keeps the fetch away from session state
+    fetcher = VideoContentFetcher(youtube_api_key, gemini_api_key or "")
+    if not youtube_api_key:
+        return VideoFeed(patch_version, tuple(fetcher.fallback_videos), time.time(), live=False)
+    return _video_feeds.get(
+        patch_version,
+        lambda: fetcher.fetch_videos(patch_version),
+        fetcher.fallback_videos,
+        refresh=refresh
+    )
+
+
+def video_feed_due_for_refresh(patch_version: str, within: float) -> bool:
+    """Whether the shared feed for a patch is missing, or read by a page and expiring within `within` seconds"""
+    return _video_feeds.due_for_refresh(patch_version, within)
@@ -1,24 +1,50 @@
 import streamlit as st
 import json
-from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.chains import ConversationalRetrievalChain
+from langchain.chains.conversational_retrieval.base import _get_chat_history
 from langchain_community.chat_models import ChatOpenAI
 import os
-import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 
-def save_analysis_to_file(analysis_data: dict) -> str:
-    """
-    Save analysis data to a temporary file and return the file path
-    """
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.json', mode='w') as temp_file:
-        json.dump(analysis_data, temp_file, indent=2)
-        return temp_file.name
+from utils.embeddings import get_embeddings
+from utils.bm25_retriever import BM25Retriever, chunk_analysis
+from utils.answer_cache import AnswerCache
+
+# Chat chains kept in memory, one per distinct analysis (and API key)
+MAX_CHAT_CHAINS = int(os.getenv("MAX_CHAT_CHAINS", "64"))
+
+_chains: "OrderedDict[str, AnalysisChat]" = OrderedDict()
+_chains_lock = threading.Lock()
+
+# Model that rewrites follow-ups into standalone questions (a short, cheap completion)
+CHAT_CONDENSE_MODEL = os.getenv("CHAT_CONDENSE_MODEL", "gpt-3.5-turbo")
+CHAT_CONDENSE_MAX_TOKENS = 96
+
+# "faiss" (dense embeddings over whole sections) or "bm25" (keyword search over per-fact chunks)
+CHAT_RETRIEVER = os.getenv("CHAT_RETRIEVER", "faiss")
+
+@dataclass
+class AnalysisChat:
+    """Chat chain over one analysis plus the answers it has already given"""
+    chain: ConversationalRetrievalChain
+    answers: AnswerCache
+
+def analysis_fingerprint(analysis_data: dict) -> str:
+    """Content hash of analysis results, stable across reruns and key order"""
+    encoded = json.dumps(analysis_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
-def create_chat_chain(file_path: str):
+def create_chat_chain(analysis_data: dict):
     """
-    Create a chat chain that can answer questions about the analysis data
+    Get a chat chain that can answer questions about the analysis data
+    
+    Chains are built (and the analysis embedded) once per distinct analysis and
+    reused from a bounded process-wide cache on later reruns, together with the
+    answers already given about that analysis.
     """
     # Get API key from session state first, then environment
     api_key = st.session_state.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
@@ -26,38 +52,113 @@ def create_chat_chain(file_path: str):
     if not api_key:
         raise ValueError("OpenAI API key not found. Please set your API key in the sidebar.")
     
-    # Initialize embeddings and vector store
-    embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+    # Chains embed the analysis with the caller's key, so the key is part of the cache key
+    key_fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    cache_key = f"{analysis_fingerprint(analysis_data)}:{key_fingerprint}"
+    
+    with _chains_lock:
+        qa = _chains.get(cache_key)
+        if qa is not None:
+            _chains.move_to_end(cache_key)
+            return qa
+    
+    qa = AnalysisChat(
+        chain=_build_chat_chain(analysis_data, api_key),
+        answers=AnswerCache(get_embeddings(api_key))
+    )
     
-    # Load and process the analysis data
-    with open(file_path, 'r') as f:
-        analysis_data = json.load(f)
+    with _chains_lock:
+        # Another rerun may have built the same chain meanwhile; keep the first one
+        qa = _chains.setdefault(cache_key, qa)
+        _chains.move_to_end(cache_key)
+        while len(_chains) > MAX_CHAT_CHAINS:
+            _chains.popitem(last=False)
+    
+    return qa
+
+def build_retriever(analysis_data: dict, api_key: str = None, kind: str = CHAT_RETRIEVER):
+    """
+    Build the retriever the chat chain searches the analysis with
+    
+    Args:
+        analysis_data: Analysis results
+        api_key: OpenAI API key (only needed for OpenAI embeddings)
+        kind: "faiss" or "bm25"
+    """
+    if kind == "bm25":
+        # Keyword search over one chunk per strength, win condition, lane tip, ...
+        return BM25Retriever.from_documents(chunk_analysis(analysis_data))
+    
+    if kind != "faiss":
+        raise ValueError(f"Unknown chat retriever: {kind}")
+    
+    # Initialize embeddings (local or OpenAI, see EMBEDDING_BACKEND) and vector store
+    embeddings = get_embeddings(api_key)
     
     # Create text chunks from analysis data
     text_chunks = []
     for section, content in analysis_data.items():
         text_chunks.append(f"{section}: {json.dumps(content, indent=2)}")
-        print(f"{section}: {json.dumps(content, indent=2)}")
+    
     # Create vector store
     docsearch = FAISS.from_texts(text_chunks, embeddings)
-    
-    # Create chat chain
+    return docsearch.as_retriever(search_kwargs={"k": 3})
+
+def _build_chat_chain(analysis_data: dict, api_key: str) -> ConversationalRetrievalChain:
+    """Wrap a retriever over the analysis in a conversational retrieval chain"""
     model = ChatOpenAI(temperature=0.0, openai_api_key=api_key)
+    condense_model = ChatOpenAI(
+        temperature=0.0,
+        model_name=CHAT_CONDENSE_MODEL,
+        max_tokens=CHAT_CONDENSE_MAX_TOKENS,
+        openai_api_key=api_key
+    )
     qa = ConversationalRetrievalChain.from_llm(
         llm=model,
-        retriever=docsearch.as_retriever(search_kwargs={"k": 3}),
+        condense_question_llm=condense_model,
+        retriever=build_retriever(analysis_data, api_key),
         return_source_documents=True
     )
     
     return qa
 
-def answer_question(qa_chain, question: str, chat_history: list):
+def answer_question(qa_chain: AnalysisChat, question: str, chat_history: list):
     """
     Get an answer to a question using the chat chain
+    
+    The same or a near-duplicate question about the same analysis is answered
+    from the answer cache without calling the LLM, on every turn. Follow-ups
+    ("why?", "and for mid?") are rewritten into a standalone question once,
+    with the small condense model, which is looked up as a second key; answers
+    are only ever cached under standalone questions, so context-dependent
+    strings never become keys.
     """
-    result = qa_chain({
-        "question": question,
-        "chat_history": chat_history
+    cached = qa_chain.answers.get(question)
+    if cached is not None:
+        return cached
+    
+    standalone_question = condense_question(qa_chain.chain, question, chat_history)
+    if standalone_question != question:
+        cached = qa_chain.answers.get(standalone_question)
+        if cached is not None:
+            return cached
+    
+    # The question is already standalone, so the chain answers without condensing it again
+    result = qa_chain.chain({
+        "question": standalone_question,
+        "chat_history": []
     })
     
+    qa_chain.answers.put(standalone_question, result["answer"])
     return result["answer"]
+
+def condense_question(chain: ConversationalRetrievalChain, question: str, chat_history: list) -> str:
+    """Rewrite a follow-up into a standalone question (no LLM call without chat history)"""
+    if not chat_history:
+        return question
+    get_chat_history = chain.get_chat_history or _get_chat_history
+    standalone_question = chain.question_generator.run(
+        question=question,
+        chat_history=get_chat_history(chat_history)
+    )
+    return standalone_question.strip() or question
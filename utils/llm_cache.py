@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.cache_dir import get_cache_dir
+
+# Responses kept on disk before the least recently used ones are evicted
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    analysis_type TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def canonicalize(data: Any) -> Any:
+    """Normalize an analysis input so equivalent drafts produce the same key"""
+    if isinstance(data, dict):
+        return {str(key): canonicalize(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [canonicalize(value) for value in data]
+    if isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def make_cache_key(
+    analysis_type: str,
+    prompts_version: str,
+    model: str,
+    temperature: float,
+    data: Any,
+    patch: Optional[str] = None
+) -> str:
+    """Hash everything that determines a completion into a cache key"""
+    payload = json.dumps(
+        {
+            "analysis_type": analysis_type,
+            "prompts_version": prompts_version,
+            "model": model,
+            "temperature": temperature,
+            "patch": patch,
+            "data": canonicalize(data),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Parsed LLM responses in SQLite with LRU eviction and hit/miss counters"""
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path) if path else get_cache_dir("llm") / "responses.sqlite3"
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, counting the lookup as a hit or a miss"""
+        conn = self._connection()
+        with conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE cache_key = ?", (time.time(), cache_key)
+                )
+            self._count(conn, "hits" if row is not None else "misses")
+        return json.loads(row["response"]) if row is not None else None
+
+    def put(self, cache_key: str, analysis_type: str, response: Dict[str, Any]):
+        """Store a response and evict the least recently used ones over the limit"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (cache_key, analysis_type, response, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (cache_key, analysis_type, json.dumps(response, ensure_ascii=False), now, now)
+            )
+            evicted = conn.execute(
+                """
+                DELETE FROM responses WHERE cache_key NOT IN (
+                    SELECT cache_key FROM responses ORDER BY accessed_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+            if evicted > 0:
+                self._count(conn, "evictions", evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and the current number of entries"""
+        conn = self._connection()
+        counts = {row["name"]: row["count"] for row in conn.execute("SELECT name, count FROM stats")}
+        entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        hits = counts.get("hits", 0)
+        misses = counts.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": counts.get("evictions", 0),
+            "entries": entries,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def clear(self):
+        """Drop all cached responses and reset the counters"""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM stats")
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            "INSERT INTO stats (name, count) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET count = count + ?",
+            (name, amount, amount)
+        )
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
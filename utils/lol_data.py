@@ -1,87 +1,50 @@
 import os
 import json
+import time
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 
+from utils.champion_index import ChampionIndex, ROLES, ROLE_BITS
+from utils.champion_icons import get_champion_icon_service
+from utils.ddragon import get_static_data_store
+from utils.match_store import get_match_store
+from utils.riot_client import RiotClient, get_riot_client
+from utils.summoner_cache import SummonerProfile, get_summoner_profile_cache
+
+# Number of recent matches loaded for the player profile
+MATCH_HISTORY_COUNT = 20
+
+# Match details are fetched in parallel; RiotClient keeps them within the rate limits
+MATCH_FETCH_WORKERS = 8
+
 # Champion data
-@st.cache_data
+def get_champion_index() -> ChampionIndex:
+    """Get the champion index for the latest patch"""
+    return get_static_data_store().champion_index()
+
 def load_champion_list():
     """Load list of LoL champions from Data Dragon API"""
     try:
-        # Get latest version
-        versions_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-        versions_response = requests.get(versions_url)
-        versions_response.raise_for_status()
-        latest_version = versions_response.json()[0]
-        
-        # Get champion data
-        champions_url = f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
-        champions_response = requests.get(champions_url)
-        champions_response.raise_for_status()
-        champions_data = champions_response.json()
-        
-        # Extract champion names and sort alphabetically
-        champion_list = sorted(champions_data["data"].keys())
-        return champion_list
+        # Champion names are already sorted alphabetically in the index
+        return list(get_champion_index().names)
         
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching champion data: {str(e)}")
         # Fallback to empty list if API fails
         return []
 
-@st.cache_data
-def get_champion_roles():
-    """Get champion roles from Data Dragon API"""
+def get_champion_roles() -> Dict[str, tuple]:
+    """Get sorted champion tuples per role from Data Dragon API"""
     try:
-        # Get latest version
-        versions_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-        versions_response = requests.get(versions_url)
-        versions_response.raise_for_status()
-        latest_version = versions_response.json()[0]
-        
-        # Get champion data
-        champions_url = f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
-        champions_response = requests.get(champions_url)
-        champions_response.raise_for_status()
-        champions_data = champions_response.json()
-        
-        # Initialize role lists
-        roles = {
-            "Top": [],
-            "Jungle": [],
-            "Mid": [],
-            "ADC": [],
-            "Support": []
-        }
-        
-        # Map Data Dragon tags to roles
-        role_mapping = {
-            "Fighter": ["Top", "Jungle"],
-            "Tank": ["Top", "Support", "Jungle"],
-            "Mage": ["Mid", "Support"],
-            "Assassin": ["Mid", "Jungle"],
-            "Marksman": ["ADC"],
-            "Support": ["Support"]
-        }
-        
-        # Categorize champions by their tags
-        for champ_name, champ_data in champions_data["data"].items():
-            for tag in champ_data["tags"]:
-                for role in role_mapping.get(tag, []):
-                    if champ_name not in roles[role]:
-                        roles[role].append(champ_name)
-        
-        # Sort champions in each role
-        for role in roles:
-            roles[role].sort()
-        
-        return roles
+        champion_index = get_champion_index()
+        return {role: champion_index.champions_for_role(role) for role in ROLES}
         
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching champion roles: {str(e)}")
         # Return empty role lists if API fails
-        return {role: [] for role in ["Top", "Jungle", "Mid", "ADC", "Support"]}
+        return {role: () for role in ROLES}
 
 def get_regions():
     """Get list of LoL regions"""
@@ -104,6 +67,99 @@ def get_region_routing(region: str) -> str:
     }
     return region_routes.get(region, "americas")
 
+def _fetch_match(client: RiotClient, routing: str, match_id: str) -> Dict[str, Any]:
+    """Fetch a single match-v5 payload"""
+    return client.get(routing, "/lol/match/v5/matches/{match_id}", match_id=match_id)
+
+def _summarize_participant(match_data: Dict[str, Any], puuid: str) -> Dict[str, Any]:
+    """Extract the player's result, KDA and CS from a match payload"""
+    # Find player in match
+    participant = next(
+        p for p in match_data["info"]["participants"]
+        if p["puuid"] == puuid
+    )
+    
+    return {
+        "match_id": match_data["metadata"]["matchId"],
+        "timestamp": match_data["info"]["gameCreation"],
+        "champion": participant["championName"],
+        "result": "Victory" if participant["win"] else "Defeat",
+        "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
+        "cs": participant["totalMinionsKilled"] + participant.get("neutralMinionsKilled", 0)
+    }
+
+def _refresh_matches(client: RiotClient, routing: str, profile: SummonerProfile):
+    """Fetch only the matches newer than the last one seen and merge them into the profile"""
+    match_store = get_match_store()
+    
+    # A fresh profile starts from the matches already stored on disk for this player
+    if not profile.matches:
+        stored_matches = match_store.get_many(match_store.recent_match_ids(profile.puuid, MATCH_HISTORY_COUNT))
+        profile.merge_matches(
+            [_summarize_participant(match_data, profile.puuid) for match_data in stored_matches.values()],
+            MATCH_HISTORY_COUNT
+        )
+    
+    params = {"start": 0, "count": MATCH_HISTORY_COUNT}
+    if profile.latest_match_time is not None:
+        params["startTime"] = profile.latest_match_time
+    
+    match_ids = client.get(
+        routing,
+        "/lol/match/v5/matches/by-puuid/{puuid}/ids",
+        params=params,
+        puuid=profile.puuid
+    )
+    known_match_ids = profile.known_match_ids
+    new_match_ids = [match_id for match_id in match_ids if match_id not in known_match_ids]
+    
+    # Finished matches never change, so only download the ones not stored yet
+    missing_match_ids = match_store.missing(new_match_ids)
+    with ThreadPoolExecutor(max_workers=MATCH_FETCH_WORKERS) as pool:
+        fetched_payloads = list(pool.map(
+            lambda match_id: _fetch_match(client, routing, match_id),
+            missing_match_ids
+        ))
+    match_store.put_many(fetched_payloads)
+    
+    match_payloads = match_store.get_many(set(new_match_ids) - set(missing_match_ids))
+    match_payloads.update((match_data["metadata"]["matchId"], match_data) for match_data in fetched_payloads)
+    profile.merge_matches(
+        [_summarize_participant(match_data, profile.puuid) for match_data in match_payloads.values()],
+        MATCH_HISTORY_COUNT
+    )
+
+def _refresh_profile(client: RiotClient, platform: str, routing: str, profile: SummonerProfile):
+    """Refetch whichever parts of a cached profile have expired"""
+    if profile.summoner_stale:
+        profile.summoner = client.get(
+            platform,
+            "/lol/summoner/v4/summoners/by-puuid/{puuid}",
+            puuid=profile.puuid
+        )
+        profile.summoner_at = time.time()
+    
+    if profile.ranked_stale:
+        profile.ranked = client.get(
+            platform,
+            "/lol/league/v4/entries/by-summoner/{summoner_id}",
+            summoner_id=profile.summoner["id"]
+        )
+        profile.ranked_at = time.time()
+    
+    if profile.matches_stale:
+        _refresh_matches(client, routing, profile)
+        profile.matches_at = time.time()
+    
+    if profile.mastery_stale:
+        profile.mastery = client.get(
+            platform,
+            "/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/top",
+            params={"count": 3},
+            puuid=profile.puuid
+        )
+        profile.mastery_at = time.time()
+
 def get_summoner_data(summoner_name: str, region: str) -> Dict[str, Any]:
     """Get summoner data from Riot API"""
     # Get API key from session state first, then environment
@@ -114,38 +170,35 @@ def get_summoner_data(summoner_name: str, region: str) -> Dict[str, Any]:
         return {}
 
     try:
-        # Base URLs
-        base_url = f"https://{region}.api.riotgames.com"
+        # Platform host (e.g. euw1) and regional routing host (e.g. europe)
+        client = get_riot_client(api_key)
+        platform = region.lower()
         routing = get_region_routing(region)
-        region_url = f"https://{routing}.api.riotgames.com"
-        
-        # Headers
-        headers = {"X-Riot-Token": api_key}
         
-        # Get summoner data
-        summoner_response = requests.get(
-            f"{base_url}/lol/summoner/v4/summoners/by-name/{summoner_name}",
-            headers=headers
-        )
-        summoner_response.raise_for_status()
-        summoner_data = summoner_response.json()
+        profile_cache = get_summoner_profile_cache()
         
-        # Get ranked data
-        ranked_response = requests.get(
-            f"{base_url}/lol/league/v4/entries/by-summoner/{summoner_data['id']}",
-            headers=headers
-        )
-        ranked_response.raise_for_status()
-        ranked_data = ranked_response.json()
+        # Resolve the summoner name to a puuid (cached alongside the profile)
+        summoner_data = None
+        puuid = profile_cache.get_puuid(region, summoner_name)
+        if puuid is None:
+            summoner_data = client.get(
+                platform,
+                "/lol/summoner/v4/summoners/by-name/{summoner_name}",
+                summoner_name=summoner_name
+            )
+            puuid = summoner_data["puuid"]
+            profile_cache.set_puuid(region, summoner_name, puuid)
         
-        # Get match history
-        matches_response = requests.get(
-            f"{region_url}/lol/match/v5/matches/by-puuid/{summoner_data['puuid']}/ids",
-            params={"start": 0, "count": 5},
-            headers=headers
-        )
-        matches_response.raise_for_status()
-        match_ids = matches_response.json()
+        # Refresh only the expired parts of the cached profile
+        profile = profile_cache.profile(region, puuid)
+        with profile.lock:
+            if summoner_data is not None:
+                profile.summoner, profile.summoner_at = summoner_data, time.time()
+            _refresh_profile(client, platform, routing, profile)
+            summoner_data = profile.summoner
+            ranked_data = profile.ranked
+            mastery_data = profile.mastery
+            recent_matches = list(profile.matches)
         
         # Process ranked data
         solo_queue_data = next(
@@ -160,67 +213,21 @@ def get_summoner_data(summoner_name: str, region: str) -> Dict[str, Any]:
             total_games = solo_queue_data["wins"] + solo_queue_data["losses"]
             win_rate = f"{(solo_queue_data['wins'] / total_games * 100):.1f}%" if total_games > 0 else "0%"
         
-        # Get recent matches data
-        recent_matches = []
-        for match_id in match_ids:
-            match_response = requests.get(
-                f"{region_url}/lol/match/v5/matches/{match_id}",
-                headers=headers
-            )
-            match_response.raise_for_status()
-            match_data = match_response.json()
-            
-            # Find player in match
-            participant = next(
-                p for p in match_data["info"]["participants"]
-                if p["puuid"] == summoner_data["puuid"]
-            )
-            
-            recent_matches.append({
-                "champion": participant["championName"],
-                "result": "Victory" if participant["win"] else "Defeat",
-                "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
-                "cs": participant["totalMinionsKilled"] + participant.get("neutralMinionsKilled", 0)
-            })
-        
-        # Get mastery data for top champions
-        mastery_response = requests.get(
-            f"{base_url}/lol/champion-mastery/v4/champion-masteries/by-puuid/{summoner_data['puuid']}/top",
-            params={"count": 3},
-            headers=headers
-        )
-        mastery_response.raise_for_status()
-        mastery_data = mastery_response.json()
-        
-        # Get champion data to map IDs to names
-        versions_response = requests.get("https://ddragon.leagueoflegends.com/api/versions.json")
-        versions_response.raise_for_status()
-        latest_version = versions_response.json()[0]
-        
-        champions_response = requests.get(
-            f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
-        )
-        champions_response.raise_for_status()
-        champions_data = champions_response.json()["data"]
-        
         # Map champion IDs to names
-        champion_id_to_name = {
-            int(champ_data["key"]): champ_name 
-            for champ_name, champ_data in champions_data.items()
-        }
-        
+        champion_index = get_champion_index()
         top_champions = [
-            champion_id_to_name[mastery["championId"]]
-            for mastery in mastery_data
+            champion_name
+            for champion_name in (champion_index.name_for_id(mastery["championId"]) for mastery in mastery_data)
+            if champion_name
         ]
         
         # Determine main role based on recent matches and champion masteries
-        role_counts = {"Top": 0, "Jungle": 0, "Mid": 0, "ADC": 0, "Support": 0}
-        champion_roles = get_champion_roles()
+        role_counts = {role: 0 for role in ROLES}
         
         for champion in top_champions + [match["champion"] for match in recent_matches]:
-            for role, champions in champion_roles.items():
-                if champion in champions:
+            role_mask = champion_index.role_mask(champion)
+            for role in ROLES:
+                if role_mask & ROLE_BITS[role]:
                     role_counts[role] += 1
         
         main_role = max(role_counts.items(), key=lambda x: x[1])[0]
@@ -240,15 +247,17 @@ def get_summoner_data(summoner_name: str, region: str) -> Dict[str, Any]:
         return {}
 
 def get_champion_icon_url(champion_name):
-    """Get champion icon URL from Data Dragon"""
+    """Get a locally cached champion icon URL"""
     try:
-        # Get latest version
-        versions_response = requests.get("https://ddragon.leagueoflegends.com/api/versions.json")
-        versions_response.raise_for_status()
-        latest_version = versions_response.json()[0]
-        
-        sanitized_name = champion_name.replace("'", "").replace(" ", "").replace(".", "")
-        return f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/img/champion/{sanitized_name}.png"
+        return get_champion_icon_service().icon_url(champion_name)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching champion icon URL: {str(e)}")
-        return ""
\ No newline at end of file
+        return ""
+
+def get_champion_icon_html(champion_name, size=48, css_class="champion-icon", style=""):
+    """Get champion icon HTML rendered from the locally cached sprite sheets"""
+    try:
+        return get_champion_icon_service().icon_html(champion_name, size, css_class, style)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching champion icon: {str(e)}")
+        return ""
@@ -0,0 +1,167 @@
+import json
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils.cache_dir import get_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    content_hash TEXT PRIMARY KEY,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL REFERENCES payloads (content_hash),
+    game_creation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS participants (
+    match_id TEXT NOT NULL REFERENCES matches (match_id),
+    puuid TEXT NOT NULL,
+    champion_id INTEGER,
+    champion_name TEXT,
+    team_position TEXT,
+    win INTEGER,
+    kills INTEGER,
+    deaths INTEGER,
+    assists INTEGER,
+    cs INTEGER,
+    game_creation INTEGER NOT NULL,
+    PRIMARY KEY (match_id, puuid)
+);
+CREATE INDEX IF NOT EXISTS idx_participants_puuid ON participants (puuid, game_creation DESC);
+CREATE INDEX IF NOT EXISTS idx_participants_champion ON participants (champion_name, puuid);
+"""
+
+
+class MatchStore:
+    """Finished match-v5 payloads stored once in SQLite, with a per-participant table"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else get_cache_dir("riot") / "matches.sqlite3"
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Get a stored match payload"""
+        return self.get_many([match_id]).get(match_id)
+
+    def get_many(self, match_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the stored payloads for the given match IDs, skipping unknown ones"""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return {}
+
+        placeholders = ",".join("?" * len(match_ids))
+        rows = self._connection().execute(
+            f"""
+            SELECT m.match_id, p.payload FROM matches m
+            JOIN payloads p ON p.content_hash = m.content_hash
+            WHERE m.match_id IN ({placeholders})
+            """,
+            match_ids
+        ).fetchall()
+        return {row["match_id"]: json.loads(zlib.decompress(row["payload"])) for row in rows}
+
+    def missing(self, match_ids: Iterable[str]) -> List[str]:
+        """Get the match IDs that are not stored yet, keeping their order"""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return []
+
+        placeholders = ",".join("?" * len(match_ids))
+        rows = self._connection().execute(
+            f"SELECT match_id FROM matches WHERE match_id IN ({placeholders})",
+            match_ids
+        ).fetchall()
+        stored = {row["match_id"] for row in rows}
+        return [match_id for match_id in match_ids if match_id not in stored]
+
+    def put_many(self, match_payloads: Iterable[Dict[str, Any]]):
+        """Store finished match payloads and their participants"""
+        conn = self._connection()
+        with conn:
+            for match_data in match_payloads:
+                encoded = json.dumps(match_data, separators=(",", ":"), sort_keys=True).encode("utf-8")
+                content_hash = hashlib.sha256(encoded).hexdigest()
+                match_id = match_data["metadata"]["matchId"]
+                game_creation = match_data["info"]["gameCreation"]
+
+                conn.execute(
+                    "INSERT OR IGNORE INTO payloads (content_hash, payload) VALUES (?, ?)",
+                    (content_hash, zlib.compress(encoded))
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO matches (match_id, content_hash, game_creation) VALUES (?, ?, ?)",
+                    (match_id, content_hash, game_creation)
+                )
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO participants (
+                        match_id, puuid, champion_id, champion_name, team_position,
+                        win, kills, deaths, assists, cs, game_creation
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            match_id,
+                            p["puuid"],
+                            p.get("championId"),
+                            p.get("championName"),
+                            p.get("teamPosition"),
+                            int(bool(p.get("win"))),
+                            p.get("kills"),
+                            p.get("deaths"),
+                            p.get("assists"),
+                            p.get("totalMinionsKilled", 0) + p.get("neutralMinionsKilled", 0),
+                            game_creation,
+                        )
+                        for p in match_data["info"]["participants"]
+                    ]
+                )
+
+    def recent_match_ids(self, puuid: str, limit: int) -> List[str]:
+        """Get a player's stored match IDs, newest first"""
+        rows = self._connection().execute(
+            "SELECT match_id FROM participants WHERE puuid = ? ORDER BY game_creation DESC LIMIT ?",
+            (puuid, limit)
+        ).fetchall()
+        return [row["match_id"] for row in rows]
+
+    def participations(self, puuid: str, champion_name: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get a player's stored per-match stats, optionally for one champion, newest first"""
+        query = "SELECT * FROM participants WHERE puuid = ?"
+        params: list = [puuid]
+        if champion_name:
+            query += " AND champion_name = ?"
+            params.append(champion_name)
+        query += " ORDER BY game_creation DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connection().execute(query, params).fetchall()]
+
+
+_store: Optional[MatchStore] = None
+_store_lock = threading.Lock()
+
+
+def get_match_store() -> MatchStore:
+    """Get the process-wide match store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MatchStore()
+    return _store
@@ -1,87 +1,177 @@
-import openai
 import os
 import streamlit as st
 import json
 
-def get_analysis(analysis_type, data):
+from utils.ddragon import get_latest_version
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.partial_json import IncrementalJSONParser
+
+MODEL = "gpt-3.5-turbo-1106"
+TEMPERATURE = 0.7
+
+# Bump whenever SYSTEM_PROMPTS or the user prompt templates change, so cached responses are not reused
+SYSTEM_PROMPTS_VERSION = "2"
+
+
+class AnalysisCancelled(Exception):
+    """Raised from an on_update callback to stop a streaming analysis whose result is no longer wanted"""
+
+
+def _analysis_cache_key(analysis_type, data):
+    """Cache key for an analysis; includes the patch so responses roll over with the meta"""
+    try:
+        patch = get_latest_version()
+    except Exception:
+        patch = None
+    return make_cache_key(analysis_type, SYSTEM_PROMPTS_VERSION, MODEL, TEMPERATURE, data, patch)
+
+
+def build_request(analysis_type, data):
+    """
+    Build the chat completion request for an analysis
+    
+    Args:
+        analysis_type: Type of analysis (team_analysis, player_analysis, matchup_insights, full_draft)
+        data: Data for analysis
+        
+    Returns:
+        dict: Keyword arguments for chat.completions.create
+    """
+    system_prompt = SYSTEM_PROMPTS.get(analysis_type, SYSTEM_PROMPTS["team_analysis"])
+    
+    # Prepare user prompt based on analysis type
+    if analysis_type == "team_analysis":
+        user_prompt = f"""
+        Blue Team: {', '.join(data['blue'])}
+        Red Team: {', '.join(data['red'])}
+        Team to analyze: {data['side']}
+        
+        Provide detailed team composition analysis.
+        """
+    elif analysis_type == "player_analysis":
+        user_prompt = f"""
+        Summoner Name: {data['summoner_name']}
+        Region: {data['region']}
+        Champion: {data['champion']}
+        Role: {data['role']}
+        
+        Provide detailed player analysis for this champion and role.
+        """
+    elif analysis_type == "matchup_insights":
+        user_prompt = f"""
+        Blue Team: 
+        - Top: {data['blue'][0]}
+        - Jungle: {data['blue'][1]}
+        - Mid: {data['blue'][2]}
+        - ADC: {data['blue'][3]}
+        - Support: {data['blue'][4]}
+        
+        Red Team:
+        - Top: {data['red'][0]}
+        - Jungle: {data['red'][1]}
+        - Mid: {data['red'][2]}
+        - ADC: {data['red'][3]}
+        - Support: {data['red'][4]}
+        
+        Perspective: {data['perspective']} team
+        
+        Provide detailed matchup analysis for all lanes.
+        """
+    elif analysis_type == "full_draft":
+        user_prompt = f"""
+        Blue Team: 
+        - Top: {data['blue'][0]}
+        - Jungle: {data['blue'][1]}
+        - Mid: {data['blue'][2]}
+        - ADC: {data['blue'][3]}
+        - Support: {data['blue'][4]}
+        
+        Red Team:
+        - Top: {data['red'][0]}
+        - Jungle: {data['red'][1]}
+        - Mid: {data['red'][2]}
+        - ADC: {data['red'][3]}
+        - Support: {data['red'][4]}
+        
+        Perspective: {data['perspective']} team
+        
+        Summoner Name: {data['summoner_name']}
+        Region: {data['region']}
+        Champion: {data['champion']}
+        Role: {data['role']}
+        
+        Provide the team composition analysis for the {data['perspective']} team, the player
+        analysis for this champion and role, and the matchup analysis for all lanes.
+        """
+    
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": TEMPERATURE,
+        "response_format": {"type": "json_object"}
+    }
+
+
+def get_analysis(analysis_type, data, api_key=None, timeout=None, on_update=None):
     """
     Get analysis from OpenAI API
     
     Args:
-        analysis_type: Type of analysis (team_analysis, player_analysis, matchup_insights)
+        analysis_type: Type of analysis (team_analysis, player_analysis, matchup_insights, full_draft)
         data: Data for analysis
+        api_key: OpenAI API key (read from session state when not given; pass it
+            explicitly when calling from a worker thread)
+        timeout: Request timeout in seconds
+        on_update: Optional callback; when given the completion is streamed and
+            called with the partial analysis each time another field finishes.
+            It may raise AnalysisCancelled to stop the stream, which propagates
         
     Returns:
         dict: Analysis results
     """
     # Get API key from session state first, then environment
-    api_key = st.session_state.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+    api_key = api_key or st.session_state.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
     
     if not api_key:
         return {
             "error": "OpenAI API key not found. Please set your API key in the sidebar."
         }
     
-    # Set the API key
-    openai.api_key = api_key
+    # Identical drafts produce identical prompts, so reuse earlier completions
+    cache = get_llm_cache()
+    cache_key = _analysis_cache_key(analysis_type, data)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Imported on first use to keep the app's cold start fast
+    import openai
+    
+    # Per-call client so concurrent sessions never share a global API key
+    client = openai.OpenAI(api_key=api_key, **({"timeout": timeout} if timeout else {}))
     
     try:
-        system_prompt = SYSTEM_PROMPTS.get(analysis_type, SYSTEM_PROMPTS["team_analysis"])
-        
-        # Prepare user prompt based on analysis type
-        if analysis_type == "team_analysis":
-            user_prompt = f"""
-            Blue Team: {', '.join(data['blue'])}
-            Red Team: {', '.join(data['red'])}
-            Team to analyze: {data['side']}
-            
-            Provide detailed team composition analysis.
-            """
-        elif analysis_type == "player_analysis":
-            user_prompt = f"""
-            Summoner Name: {data['summoner_name']}
-            Region: {data['region']}
-            Champion: {data['champion']}
-            Role: {data['role']}
-            
-            Provide detailed player analysis for this champion and role.
-            """
-        elif analysis_type == "matchup_insights":
-            user_prompt = f"""
-            Blue Team: 
-            - Top: {data['blue'][0]}
-            - Jungle: {data['blue'][1]}
-            - Mid: {data['blue'][2]}
-            - ADC: {data['blue'][3]}
-            - Support: {data['blue'][4]}
-            
-            Red Team:
-            - Top: {data['red'][0]}
-            - Jungle: {data['red'][1]}
-            - Mid: {data['red'][2]}
-            - ADC: {data['red'][3]}
-            - Support: {data['red'][4]}
-            
-            Perspective: {data['perspective']} team
-            
-            Provide detailed matchup analysis for all lanes.
-            """
+        request = build_request(analysis_type, data)
         
         # Call OpenAI API
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo-1106",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
-        )
+        if on_update is None:
+            response = client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+        else:
+            content = _stream_completion(client, request, on_update)
         
         # Parse response
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
+        
+        # Errors are never cached, only successful analyses
+        cache.put(cache_key, analysis_type, result)
         return result
             
+    except AnalysisCancelled:
+        raise
     except openai.AuthenticationError:
         return {
             "error": "Invalid OpenAI API key. Please check your API key and try again."
@@ -95,6 +185,26 @@ def get_analysis(analysis_type, data):
             "error": f"Error generating analysis: {str(e)}"
         }
 
+def _stream_completion(client, request, on_update):
+    """Stream a JSON completion, reporting each newly completed part, and return the full text"""
+    parser = IncrementalJSONParser()
+    last_partial = None
+    
+    for chunk in client.chat.completions.create(stream=True, **request):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        
+        parser.feed(delta)
+        partial = parser.snapshot()
+        if isinstance(partial, dict) and partial is not last_partial:
+            last_partial = partial
+            on_update(partial)
+    
+    return parser.text
+
 # System prompts for different analysis types
 SYSTEM_PROMPTS = {
     "team_analysis": """
@@ -157,5 +267,49 @@ SYSTEM_PROMPTS = {
         "adc": {...},
         "support": {...}
     }
+    """,
+    
+    "full_draft": """
+    You are an expert League of Legends analyst. In a single response, analyze the given draft:
+    1. The team composition of the requested perspective (strengths, weaknesses, win conditions,
+       scaling, playstyle and team fight potential)
+    2. The summoner's performance on their champion and role (strengths, areas for improvement,
+       itemization and key performance metrics)
+    3. Every lane matchup (favorability, advantage, tips and counter-play)
+    
+    Format your response as JSON with the following structure:
+    {
+        "team_analysis": {
+            "summary": "Brief overall team comp summary",
+            "strengths": ["strength1", "strength2", ...],
+            "weaknesses": ["weakness1", "weakness2", ...],
+            "win_conditions": ["condition1", "condition2", ...],
+            "scaling": "early/mid/late game rating out of 10",
+            "playstyle": "suggested playstyle description",
+            "teamfight": "team fight analysis"
+        },
+        "player_analysis": {
+            "summary": "Brief player analysis summary",
+            "strengths": ["strength1", "strength2", ...],
+            "improvements": ["area1", "area2", ...],
+            "itemization": ["core item1", "core item2", "situational items", ...],
+            "performance_metrics": {"metric1": "description", "metric2": "description", ...}
+        },
+        "matchup_insights": {
+            "top": {
+                "favorable": true/false,
+                "advantage": "Strong/Slight/Even/Slight Disadvantage/Strong Disadvantage",
+                "tips": ["tip1", "tip2", ...],
+                "counter_strategy": "description"
+            },
+            "jungle": {...},
+            "mid": {...},
+            "adc": {...},
+            "support": {...}
+        }
+    }
     """
-}
\ No newline at end of file
+}
+
+# Sections returned by the "full_draft" analysis
+FULL_DRAFT_SECTIONS = ("team_analysis", "player_analysis", "matchup_insights")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import json
+from typing import Any, List, Optional
+
+
+class IncrementalJSONParser:
+    """
+    Parse a JSON document while it is still streaming in
+
+    Chunks are scanned once as they arrive. The parser remembers the last
+    position where every value so far is complete, so `snapshot()` can cut the
+    text there, close the open objects/arrays and decode it. Fields therefore
+    appear only once they have finished streaming (a half-written string is
+    never shown).
+    """
+
+    def __init__(self):
+        self._text: List[str] = []
+        self._length = 0
+        # Open containers, each [bracket, expecting_key]
+        self._stack: List[list] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escaped = False
+        self._safe_end = 0
+        self._safe_closers = ""
+        self._snapshot_end = -1
+        self._snapshot: Optional[Any] = None
+
+    def feed(self, chunk: str):
+        """Add the next chunk of streamed text"""
+        for offset, char in enumerate(chunk):
+            position = self._length + offset
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if not self._string_is_key:
+                        self._mark_safe(position + 1)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = bool(self._stack) and self._stack[-1][0] == "{" and self._stack[-1][1]
+                if self._string_is_key:
+                    self._stack[-1][1] = False
+            elif char in "{[":
+                self._stack.append([char, char == "{"])
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._mark_safe(position + 1)
+            elif char == ",":
+                # Whatever preceded the comma (including numbers and literals) is complete
+                self._mark_safe(position)
+                if self._stack and self._stack[-1][0] == "{":
+                    self._stack[-1][1] = True
+
+        self._text.append(chunk)
+        self._length += len(chunk)
+
+    def snapshot(self) -> Optional[Any]:
+        """Decode everything that has fully arrived, or None if nothing has yet"""
+        if self._safe_end == 0:
+            return None
+        if self._safe_end != self._snapshot_end:
+            text = "".join(self._text)
+            self._text = [text]
+            try:
+                self._snapshot = json.loads(text[:self._safe_end] + self._safe_closers)
+            except json.JSONDecodeError:
+                # Keep the previous snapshot if the cut point was not decodable
+                pass
+            self._snapshot_end = self._safe_end
+        return self._snapshot
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text)
+
+    def _mark_safe(self, end: int):
+        self._safe_end = end
+        self._safe_closers = "".join("}" if bracket == "{" else "]" for bracket, _ in reversed(self._stack))
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """Decode the complete part of a possibly truncated JSON document"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.snapshot()
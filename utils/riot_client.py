@@ -0,0 +1,204 @@
+import os
+import time
+import threading
+import requests
+from collections import deque
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, Tuple
+
+# Overridable so the app can point at a local stand-in (see benchmarks/riot_standin.py)
+RIOT_API_URL_TEMPLATE = os.getenv("RIOT_API_URL_TEMPLATE", "https://{host}.api.riotgames.com")
+
+# Development key limits, used until the first response tells us the real ones
+DEFAULT_APP_RATE_LIMIT = "20:1,100:120"
+
+# Connections kept alive per platform/regional host
+POOL_SIZE = 16
+
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 3
+
+# Extra seconds a spent token is held, since Riot counts requests when they arrive, not when we send them
+WINDOW_PADDING = 0.1
+
+
+def parse_rate_limit(header: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a Riot rate limit header like "20:1,100:120" into (count, seconds) pairs"""
+    limits = []
+    for part in (header or "").split(","):
+        if ":" in part:
+            count, seconds = part.strip().split(":")
+            limits.append((int(count), int(seconds)))
+    return limits
+
+
+class TokenBucket:
+    """Allows `limit` requests in any `window` seconds; each spent token returns after the window"""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self._spent = deque()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        while self._spent and now - self._spent[0] >= self.window + WINDOW_PADDING:
+            self._spent.popleft()
+        if len(self._spent) < self.limit:
+            return 0.0
+        return self.window + WINDOW_PADDING - (now - self._spent[0])
+
+    def spend(self, now: float):
+        self._spent.append(now)
+
+    def sync(self, server_count: int, now: float):
+        """Account for requests the server has seen but we have not (other processes using the key)"""
+        self.wait_time(now)
+        for _ in range(server_count - len(self._spent)):
+            self._spent.append(now)
+
+
+class RateLimiter:
+    """A set of token buckets for one rate limit scope (app or method)"""
+
+    def __init__(self, header: Optional[str] = None):
+        self.header = header
+        self.buckets = [TokenBucket(count, seconds) for count, seconds in parse_rate_limit(header)]
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        waits = [bucket.wait_time(now) for bucket in self.buckets]
+        return max(waits + [self.blocked_until - now, 0.0])
+
+    def spend(self, now: float):
+        for bucket in self.buckets:
+            bucket.spend(now)
+
+    def update(self, header: Optional[str], count_header: Optional[str], now: float):
+        """Adopt the limits and counts reported in a response"""
+        if header and header != self.header:
+            spent = max((len(bucket._spent) for bucket in self.buckets), default=0)
+            self.header = header
+            self.buckets = [TokenBucket(count, seconds) for count, seconds in parse_rate_limit(header)]
+            for bucket in self.buckets:
+                bucket.sync(spent, now)
+
+        counts = dict((seconds, count) for count, seconds in parse_rate_limit(count_header))
+        for bucket in self.buckets:
+            if bucket.window in counts:
+                bucket.sync(counts[bucket.window], now)
+
+
+class RiotClient:
+    """Riot API client with keep-alive sessions per host and app/method rate limiting"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._sessions: Dict[str, requests.Session] = {}
+        self._app_limiters: Dict[str, RateLimiter] = {}
+        self._method_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, path: str, params: Optional[Dict[str, Any]] = None, **path_params) -> Any:
+        """
+        GET a Riot endpoint and return the decoded JSON
+
+        Args:
+            host: Platform (e.g. "euw1") or regional routing value (e.g. "europe")
+            path: Endpoint path template, e.g. "/lol/match/v5/matches/{match_id}"
+            params: Query parameters
+            path_params: Values substituted into the path template
+        """
+        # Method limits are per endpoint, so the unformatted path is the method key
+        method = path
+        url = RIOT_API_URL_TEMPLATE.format(host=host) + path.format(**path_params)
+        session = self._session(host)
+
+        for attempt in range(MAX_RETRIES + 1):
+            self._acquire(host, method)
+            response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            self._record(host, method, response)
+
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response.json()
+
+            self._back_off(host, method, response, attempt)
+
+    def _session(self, host: str) -> requests.Session:
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = requests.Session()
+                    session.headers.update({"X-Riot-Token": self.api_key})
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._sessions[host] = session
+        return session
+
+    def _limiters(self, host: str, method: str) -> Tuple[RateLimiter, RateLimiter]:
+        app_limiter = self._app_limiters.get(host)
+        if app_limiter is None:
+            app_limiter = self._app_limiters[host] = RateLimiter(DEFAULT_APP_RATE_LIMIT)
+        method_limiter = self._method_limiters.get((host, method))
+        if method_limiter is None:
+            method_limiter = self._method_limiters[(host, method)] = RateLimiter()
+        return app_limiter, method_limiter
+
+    def _acquire(self, host: str, method: str):
+        """Block until both the app and the method limits allow another request"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                limiters = self._limiters(host, method)
+                wait = max(limiter.wait_time(now) for limiter in limiters)
+                if wait <= 0:
+                    for limiter in limiters:
+                        limiter.spend(now)
+                    return
+            time.sleep(wait)
+
+    def _record(self, host: str, method: str, response: requests.Response):
+        """Update the buckets from the rate limit headers of a response"""
+        with self._lock:
+            now = time.monotonic()
+            app_limiter, method_limiter = self._limiters(host, method)
+            app_limiter.update(
+                response.headers.get("X-App-Rate-Limit"),
+                response.headers.get("X-App-Rate-Limit-Count"),
+                now
+            )
+            method_limiter.update(
+                response.headers.get("X-Method-Rate-Limit"),
+                response.headers.get("X-Method-Rate-Limit-Count"),
+                now
+            )
+
+    def _back_off(self, host: str, method: str, response: requests.Response, attempt: int):
+        """Honor Retry-After on a 429 by blocking the limit that was hit"""
+        retry_after = response.headers.get("Retry-After")
+        delay = float(retry_after) if retry_after else 2 ** attempt
+
+        with self._lock:
+            app_limiter, method_limiter = self._limiters(host, method)
+            limit_type = response.headers.get("X-Rate-Limit-Type", "application")
+            limiter = method_limiter if limit_type == "method" else app_limiter
+            limiter.blocked_until = max(limiter.blocked_until, time.monotonic() + delay)
+
+
+_clients: Dict[str, RiotClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_riot_client(api_key: str) -> RiotClient:
+    """Get the process-wide client for an API key (rate limits are tracked per key)"""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = RiotClient(api_key)
+    return client
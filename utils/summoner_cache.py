@@ -0,0 +1,134 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+# Seconds before each part of a profile is refetched
+PROFILE_TTL = float(os.getenv("SUMMONER_PROFILE_TTL", "600"))
+MASTERY_TTL = float(os.getenv("SUMMONER_MASTERY_TTL", "300"))
+RANKED_TTL = float(os.getenv("SUMMONER_RANKED_TTL", "120"))
+
+# Profiles kept in memory before the least recently used one is dropped
+MAX_PROFILES = 512
+
+# Summoner name -> puuid lookups kept in memory (several names can map to one profile)
+MAX_PUUIDS = 4 * MAX_PROFILES
+
+
+@dataclass
+class SummonerProfile:
+    """Cached Riot data for one player; each part carries its own fetch time"""
+
+    region: str
+    puuid: str
+    summoner: Dict[str, Any] = field(default_factory=dict)
+    summoner_at: float = 0.0
+    ranked: List[Dict[str, Any]] = field(default_factory=list)
+    ranked_at: float = 0.0
+    mastery: List[Dict[str, Any]] = field(default_factory=list)
+    mastery_at: float = 0.0
+    # Match summaries, newest first
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    matches_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def summoner_stale(self) -> bool:
+        return time.time() - self.summoner_at >= PROFILE_TTL
+
+    @property
+    def matches_stale(self) -> bool:
+        return time.time() - self.matches_at >= PROFILE_TTL
+
+    @property
+    def ranked_stale(self) -> bool:
+        return time.time() - self.ranked_at >= RANKED_TTL
+
+    @property
+    def mastery_stale(self) -> bool:
+        return time.time() - self.mastery_at >= MASTERY_TTL
+
+    @property
+    def known_match_ids(self) -> set:
+        return {match["match_id"] for match in self.matches}
+
+    @property
+    def latest_match_time(self) -> Optional[int]:
+        """Start time (epoch seconds) of the newest match seen so far"""
+        if not self.matches:
+            return None
+        return max(match["timestamp"] for match in self.matches) // 1000
+
+    def merge_matches(self, new_matches: List[Dict[str, Any]], limit: int):
+        """Merge newly fetched match summaries into the stored history"""
+        by_id = {match["match_id"]: match for match in self.matches}
+        by_id.update((match["match_id"], match) for match in new_matches)
+        self.matches = sorted(by_id.values(), key=lambda match: match["timestamp"], reverse=True)[:limit]
+
+
+class SummonerProfileCache:
+    """Process-wide summoner profiles keyed by (region, puuid)"""
+
+    def __init__(self, max_profiles: int = MAX_PROFILES, max_puuids: int = MAX_PUUIDS):
+        self.max_profiles = max_profiles
+        self.max_puuids = max_puuids
+        self._profiles: "OrderedDict[Tuple[str, str], SummonerProfile]" = OrderedDict()
+        self._puuids: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_puuid(self, region: str, summoner_name: str) -> Optional[str]:
+        """Get the cached puuid for a summoner name, if still fresh"""
+        key = (region, summoner_name.lower())
+        with self._lock:
+            entry = self._puuids.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] >= PROFILE_TTL:
+                del self._puuids[key]
+                return None
+            self._puuids.move_to_end(key)
+            return entry[0]
+
+    def set_puuid(self, region: str, summoner_name: str, puuid: str):
+        key = (region, summoner_name.lower())
+        with self._lock:
+            self._puuids[key] = (puuid, time.time())
+            self._puuids.move_to_end(key)
+            while len(self._puuids) > self.max_puuids:
+                self._puuids.popitem(last=False)
+
+    def profile(self, region: str, puuid: str) -> SummonerProfile:
+        """Get the profile for a player, creating an empty (stale) one if needed"""
+        key = (region, puuid)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = SummonerProfile(region=region, puuid=puuid)
+                while len(self._profiles) > self.max_profiles:
+                    evicted_key, _ = self._profiles.popitem(last=False)
+                    self._forget_puuid(evicted_key)
+            else:
+                self._profiles.move_to_end(key)
+            return profile
+
+    def invalidate(self, region: str, puuid: str):
+        """Drop a cached profile so the next lookup refetches everything"""
+        with self._lock:
+            self._profiles.pop((region, puuid), None)
+            self._forget_puuid((region, puuid))
+
+    def _forget_puuid(self, key: Tuple[str, str]):
+        region, puuid = key
+        for name_key, (cached_puuid, _) in list(self._puuids.items()):
+            if name_key[0] == region and cached_puuid == puuid:
+                del self._puuids[name_key]
+
+
+_cache = SummonerProfileCache()
+
+
+def get_summoner_profile_cache() -> SummonerProfileCache:
+    """Get the process-wide summoner profile cache"""
+    return _cache
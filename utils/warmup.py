@@ -0,0 +1,232 @@
+"""
+Cache warmup for the static data, patch analysis and video caches
+
+app.py starts the background job when the first session runs the script, so
+that visitor still waits on whatever is cold. To fill the disk caches (Data
+Dragon, sprite sheets, patch analysis) before the server takes traffic, run
+this module before `streamlit run`:
+
+    python -m utils.warmup
+"""
+import os
+import sys
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+if __name__ == "__main__":
+    # Run as a script: load .env before the utils read their settings at import time
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from utils.ddragon import get_latest_version, get_static_data_store
+
+# Seconds between warmup runs when WARMUP_INTERVAL is not set; each run refreshes whatever has gone stale
+DEFAULT_WARMUP_INTERVAL = 1800.0
+
+
+def warmup_enabled() -> bool:
+    """WARMUP_ENABLED=0 disables the job (e.g. when running scripts against the utils); read at call time"""
+    return os.getenv("WARMUP_ENABLED", "1") != "0"
+
+
+def warmup_interval() -> float:
+    return float(os.getenv("WARMUP_INTERVAL", str(DEFAULT_WARMUP_INTERVAL)))
+
+
+def _warm_static_data(version: str) -> str:
+    store = get_static_data_store()
+    index = store.champion_index(version)
+    store.items(version)
+    store.summoner_spells(version)
+    return f"{len(index.names)} champions"
+
+
+def _warm_champion_icons(version: str) -> str:
+    from utils.champion_icons import get_champion_icon_service
+
+    sheets = get_champion_icon_service().ensure_sprite_sheets(version)
+    return f"{len(sheets)} sprite sheets"
+
+
+def _warm_patch_analysis(version: str) -> Optional[str]:
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    if not gemini_api_key:
+        return None
+
+    from utils.gemini_api import GeminiMetaAnalyzer, get_patch_analysis_cache
+
+    # Stale analyses are regenerated in the background by the cache itself
+    analyzer = GeminiMetaAnalyzer(gemini_api_key)
+    patch_data = analyzer._fetch_current_patch_data()
+    get_patch_analysis_cache().get(patch_data["version"], lambda: analyzer._generate_patch_analysis(patch_data))
+    return f"patch {patch_data['version']}"
+
+
+def _warm_video_feed(version: str) -> Optional[str]:
+    youtube_api_key = os.getenv("YOUTUBE_API_KEY")
+    if not youtube_api_key:
+        return None
+
+    from utils.gemini_api import get_video_feed, video_feed_due_for_refresh
+
+    # Refresh ahead of the TTL so page views never wait for the search, but only
+    # for feeds pages actually read: an idle server spends no YouTube quota
+    if not video_feed_due_for_refresh(version, within=warmup_interval()):
+        return "up to date"
+
+    feed = get_video_feed(version, youtube_api_key, os.getenv("GEMINI_API_KEY"), refresh=True)
+    if feed.error:
+        raise RuntimeError(feed.error)
+    return f"{len(feed.videos)} videos"
+
+
+# Step name -> function taking the patch version; returns a detail string, or None when skipped
+WARMUP_STEPS: List[Tuple[str, Callable[[str], Optional[str]]]] = [
+    ("static_data", _warm_static_data),
+    ("champion_icons", _warm_champion_icons),
+    ("patch_analysis", _warm_patch_analysis),
+    ("video_feed", _warm_video_feed),
+]
+
+
+class WarmupJob:
+    """
+    Background thread that fills the process-wide caches when the server starts
+    and refreshes them every interval, so no page view pays for a cold cache
+
+    The thread never calls Streamlit; pages read its progress through status().
+    """
+
+    def __init__(self, steps=None, interval: Optional[float] = None):
+        self.steps = steps if steps is not None else WARMUP_STEPS
+        self.interval = interval if interval is not None else warmup_interval()
+        self._status: Dict[str, Any] = {
+            "state": "pending",
+            "runs": 0,
+            "version": None,
+            "last_run": None,
+            "next_run": None,
+            "steps": {name: {"state": "pending"} for name, _ in self.steps},
+        }
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background thread (once)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name="cache-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def trigger(self):
+        """Run again now instead of waiting for the next scheduled run"""
+        self._wake.set()
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of the job's progress"""
+        with self._lock:
+            status = dict(self._status)
+            status["steps"] = {name: dict(step) for name, step in self._status["steps"].items()}
+            return status
+
+    def is_warm(self) -> bool:
+        """Whether the first run has finished"""
+        with self._lock:
+            return self._status["runs"] > 0
+
+    def run_once(self):
+        """Run every warmup step in order; a failing step does not stop the others"""
+        self._update(state="running")
+        try:
+            version = get_latest_version()
+        except Exception as e:
+            self._finish_run(version=None, error=f"Could not resolve the patch version: {e}")
+            return
+
+        for name, step in self.steps:
+            self._update_step(name, state="running", started_at=time.time())
+            start = time.perf_counter()
+            try:
+                detail = step(version)
+                state = "done" if detail is not None else "skipped"
+                self._update_step(name, state=state, detail=detail, error=None)
+            except Exception as e:
+                self._update_step(name, state="failed", error=str(e))
+            self._update_step(name, seconds=round(time.perf_counter() - start, 2))
+
+        self._finish_run(version=version)
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            self.run_once()
+            self._update(next_run=time.time() + self.interval)
+            self._wake.wait(self.interval)
+
+    def _finish_run(self, version: Optional[str], error: Optional[str] = None):
+        with self._lock:
+            self._status["state"] = "failed" if error else "idle"
+            self._status["error"] = error
+            self._status["version"] = version or self._status["version"]
+            self._status["last_run"] = time.time()
+            self._status["runs"] += 1
+
+    def _update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def _update_step(self, name: str, **fields):
+        with self._lock:
+            self._status["steps"][name].update(fields)
+
+
+_job: Optional[WarmupJob] = None
+_job_lock = threading.Lock()
+
+
+def start_warmup() -> Optional[WarmupJob]:
+    """Start the process-wide warmup job on first call; later calls (every rerun) return it"""
+    global _job
+    if not warmup_enabled():
+        return None
+    if _job is None:
+        with _job_lock:
+            if _job is None:
+                _job = WarmupJob()
+                _job.start()
+    return _job
+
+
+def get_warmup_status() -> Optional[Dict[str, Any]]:
+    """Progress of the warmup job, or None if it was never started"""
+    return _job.status() if _job is not None else None
+
+
+def main():
+    """Run one warmup pass in the foreground and report each step; exits non-zero if a step failed"""
+    # The video feed lives in memory only, so warming it here would just spend YouTube quota
+    job = WarmupJob(steps=[(name, step) for name, step in WARMUP_STEPS if name != "video_feed"])
+    job.run_once()
+    status = job.status()
+    if status.get("error"):
+        sys.exit(status["error"])
+
+    print(f"Warmed patch {status['version']}")
+    for name, step in status["steps"].items():
+        detail = step.get("error") or step.get("detail") or ""
+        print(f"  {name:<15} {step['state']:<8} {step.get('seconds', 0):6.2f}s  {detail}")
+
+    if any(step["state"] == "failed" for step in status["steps"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()